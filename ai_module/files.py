@@ -0,0 +1,24 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_path(path, mode=0o644):
+    """Yields a temporary path next to `path`; on success it is made readable and renamed over `path`.
+
+    Readers never see a partial file and concurrent writers never share a
+    temporary name. mkstemp files are private (0600), so `mode` is applied
+    before the rename: worker processes may run as another user. On failure
+    the temporary file is removed and `path` is left untouched.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
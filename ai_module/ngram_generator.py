@@ -1,31 +1,207 @@
+import math
+import mmap
 import random
+import struct
+from array import array
+from bisect import bisect_right
 from collections import defaultdict
 
+import numpy as np
+
+SYMBOLS = "!@#$%^&*"
+
+# Snapshot layout (native byte order): header, then prefixes and successors
+# as UTF-32-LE text, offsets as uint32 and running counts as uint64, each
+# section starting on an 8-byte boundary so it can be viewed in place.
+SNAPSHOT_MAGIC = b"NGRM"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("=4sIIII")
+
+def _align(offset):
+    return (offset + 7) & ~7
+
 class NGramPasswordGenerator:
     def __init__(self, n=3):
         self.n = n
-        self.model = defaultdict(list)
+        # Frozen model: every prefix is interned once in `_prefixes` (fixed width
+        # n - 1) and owns the edge range offsets[row]:offsets[row + 1] of `_succ`
+        # and `_cum`. `_cum` holds running counts across all edges, so a row is
+        # sampled with a single bisect and is never mutated after training.
+        self._prefixes = ""
+        self._index = {}
+        self._offsets = array("I", [0])
+        self._succ = ""
+        self._cum = array("Q")
+        self._mmap = None
+        self._exact = {}  # include_symbols -> length-constrained tables, see _exact_tables
+
+    def __len__(self):
+        return len(self._offsets) - 1
 
     def train(self, password_list):
+        """Adds the n-gram counts of any iterable of passwords to the model.
+
+        Training is incremental: existing counts are kept, so calling this
+        again with new passwords is the same as training on both at once.
+        """
+        counts = self._thaw()
+        self._count(counts, password_list)
+        self._freeze(counts)
+
+    def train_file(self, path, encoding="utf-8"):
+        """Trains on a corpus file one line at a time, without reading it into a list."""
+        with open(path, "r", encoding=encoding, errors="replace") as f:
+            self.train(filter(None, map(str.strip, f)))
+        return self
+
+    def merge(self, other):
+        """Adds another model's counts to this one, e.g. partial models trained on corpus shards."""
+        if other.n != self.n:
+            raise ValueError(f"cannot merge a {other.n}-gram model into a {self.n}-gram model")
+        counts = self._thaw()
+        for prefix, successors in other._thaw().items():
+            mine = counts[prefix]
+            for char, count in successors.items():
+                mine[char] = mine.get(char, 0) + count
+        self._freeze(counts)
+        return self
+
+    def _count(self, counts, password_list):
+        pad = "~" * (self.n - 1)
         for pwd in password_list:
-            padded = "~" * (self.n - 1) + pwd + "~"
+            padded = pad + pwd + "~"
             for i in range(len(padded) - self.n + 1):
                 prefix = padded[i:i + self.n - 1]
                 next_char = padded[i + self.n - 1]
-                self.model[prefix].append(next_char)
+                successors = counts[prefix]
+                successors[next_char] = successors.get(next_char, 0) + 1
+
+    def __getstate__(self):
+        # Pickles as plain bytes so partial models can be returned from worker
+        # processes; a snapshot-loaded model's mmap views are copied out.
+        return {
+            "n": self.n,
+            "prefixes": self._prefixes,
+            "offsets": bytes(memoryview(self._offsets)),
+            "succ": self._succ,
+            "cum": bytes(memoryview(self._cum)),
+        }
+
+    def __setstate__(self, state):
+        self.__init__(n=state["n"])
+        self._prefixes = state["prefixes"]
+        self._offsets = array("I", state["offsets"])
+        self._succ = state["succ"]
+        self._cum = array("Q", state["cum"])
+        width = self.n - 1
+        self._index = {self._prefixes[row * width:(row + 1) * width]: row for row in range(len(self))}
+
+    def _thaw(self):
+        """Expands the frozen arrays back into {prefix: {char: count}}."""
+        counts = defaultdict(dict)
+        width = self.n - 1
+        previous = 0
+        for row in range(len(self)):
+            prefix = self._prefixes[row * width:(row + 1) * width]
+            for j in range(self._offsets[row], self._offsets[row + 1]):
+                counts[prefix][self._succ[j]] = self._cum[j] - previous
+                previous = self._cum[j]
+        return counts
+
+    def _freeze(self, counts):
+        prefixes, offsets, succ, cum = [], array("I", [0]), [], array("Q")
+        running = 0
+        for prefix in sorted(counts):
+            prefixes.append(prefix)
+            for char, count in sorted(counts[prefix].items()):
+                running += count
+                succ.append(char)
+                cum.append(running)
+            offsets.append(len(succ))
+        self._prefixes = "".join(prefixes)
+        self._index = {prefix: row for row, prefix in enumerate(prefixes)}
+        self._offsets = offsets
+        self._succ = "".join(succ)
+        self._cum = cum
+        self._exact = {}
+
+    def save(self, path):
+        """Writes the frozen model to a versioned binary snapshot."""
+        sections = [
+            self._prefixes.encode("utf-32-le"),
+            self._offsets.tobytes(),
+            self._succ.encode("utf-32-le"),
+            array("Q", self._cum).tobytes(),
+        ]
+        with open(path, "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.n, len(self), len(self._succ)))
+            for section in sections:
+                f.write(b"\0" * (_align(f.tell()) - f.tell()))
+                f.write(section)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps a snapshot written by `save`; count arrays stay on the shared page cache."""
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(buf) < SNAPSHOT_HEADER.size:
+                raise ValueError(f"{path} is too short to be an n-gram snapshot")
+            magic, version, n, rows, edges = SNAPSHOT_HEADER.unpack_from(buf)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or n < 1:
+                raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} n-gram snapshot")
+            view = memoryview(buf)
+            pos = SNAPSHOT_HEADER.size
+            sections = []
+            for size in (rows * (n - 1) * 4, (rows + 1) * 4, edges * 4, edges * 8):
+                pos = _align(pos)
+                sections.append(view[pos:pos + size])
+                pos += size
+            if len(buf) != pos:
+                raise ValueError(f"{path} is {len(buf)} bytes but its header describes {pos}; the snapshot is truncated or corrupt")
+            offsets = sections[1].cast("I")
+            if offsets[0] != 0 or offsets[rows] != edges:
+                raise ValueError(f"{path} has inconsistent row offsets; the snapshot is corrupt")
+
+            model = cls(n=n)
+            model._mmap = buf
+            model._prefixes = bytes(sections[0]).decode("utf-32-le")
+            model._offsets = offsets
+            model._succ = bytes(sections[2]).decode("utf-32-le")
+            model._cum = sections[3].cast("Q")
+        except BaseException:
+            model = sections = offsets = view = None  # drop the exported views so the map can close
+            buf.close()
+            raise
+        width = n - 1
+        model._index = {model._prefixes[row * width:(row + 1) * width]: row for row in range(rows)}
+        return model
+
+    def _sample(self, prefix, symbols=""):
+        """Draws the next character for `prefix`, mixing in `symbols` read-only."""
+        row = self._index.get(prefix)
+        if row is None:
+            base, total = 0, 1  # unseen prefix: only the terminal "~"
+        else:
+            lo, hi = self._offsets[row], self._offsets[row + 1]
+            base = self._cum[lo - 1] if lo else 0
+            total = self._cum[hi - 1] - base
+        r = random.randrange(total + len(symbols))
+        if r >= total:
+            return symbols[r - total]
+        if row is None:
+            return "~"
+        return self._succ[bisect_right(self._cum, base + r, lo, hi)]
 
     def generate(self, max_length=12, min_length=8, include_symbols=False):
         prefix = "~" * (self.n - 1)
         result = ""
         max_attempts = 100
         attempts = 0
-        symbols = "!@#$%^&*"
+        symbols = SYMBOLS if include_symbols else ""
         while attempts < max_attempts:
             attempts += 1
-            next_chars = self.model.get(prefix, ["~"])
-            if include_symbols:
-                next_chars += list(symbols)
-            next_char = random.choice(next_chars)
+            next_char = self._sample(prefix, symbols)
             if next_char == "~":
                 if len(result) >= min_length:
                     break  # Allow end only if minimum length is reached
@@ -39,4 +215,122 @@ class NGramPasswordGenerator:
 
         if attempts == max_attempts:
             print("⚠️  Password generation hit max attempts. Returning partial result.")
-        return result
\ No newline at end of file
+        return result
+
+    def _exact_tables(self, length, include_symbols):
+        """Builds, per remaining length, the sampling keys of every edge that can still end exactly on time.
+
+        States are the prefixes reachable from the start (including unseen ones
+        created by injected symbols). reach[m][s] is the probability that state
+        s emits exactly m more characters before "~"; an edge's weight with m
+        characters left is its probability times reach[m - 1] of where it
+        leads, so sampling from those weights follows the n-gram distribution
+        conditioned on the requested length.
+
+        keys[m] stores, per edge, its row's state plus the running share of the
+        row's weight up to and including that edge (accumulated within the row,
+        so rows with tiny totals keep full precision). The array is sorted and
+        state s owns (s, s + 1], so a draw of s + u lands in s's own row whether
+        it is found by a bisect over [lo, hi) or a global searchsorted.
+        """
+        cached = self._exact.get(include_symbols)
+        if cached is not None and len(cached["keys"]) > length:
+            return cached
+
+        symbols = SYMBOLS if include_symbols else ""
+        start = "~" * (self.n - 1)
+        states, queue = {start: 0}, [start]
+        sources, nexts, probs, chars = [], [], [], []
+        offsets = [0]
+        for prefix in queue:  # queue grows while iterating: breadth-first closure
+            row = self._index.get(prefix)
+            if row is None:
+                successors = [("~", 1)]
+            else:
+                lo, hi = self._offsets[row], self._offsets[row + 1]
+                running = self._cum[lo - 1] if lo else 0
+                successors = []
+                for j in range(lo, hi):
+                    successors.append((self._succ[j], self._cum[j] - running))
+                    running = self._cum[j]
+            successors += [(symbol, 1) for symbol in symbols]
+            total = sum(count for _, count in successors)
+            for char, count in successors:
+                if char == "~":
+                    target = -1
+                else:
+                    following = prefix[1:] + char
+                    if following not in states:
+                        states[following] = len(queue)
+                        queue.append(following)
+                    target = states[following]
+                sources.append(states[prefix])
+                nexts.append(target)
+                probs.append(count / total)
+                chars.append(char)
+            offsets.append(len(chars))
+
+        sources = np.array(sources, dtype=np.int64)
+        nexts = np.array(nexts, dtype=np.int64)
+        probs = np.array(probs)
+        offsets = np.array(offsets, dtype=np.int64)
+        ends = nexts < 0
+        targets = np.where(ends, 0, nexts)
+        last = offsets[1:] - 1  # every state has at least one edge
+        # Edges grouped by their position within the row, for the row-wise running sums below.
+        position = np.arange(len(sources)) - offsets[sources]
+        by_position = np.split(np.argsort(position, kind="stable"), np.cumsum(np.bincount(position))[:-1])[1:]
+
+        reach = [np.bincount(sources, weights=probs * ends, minlength=len(queue))]
+        keys = [None]  # no edge can be taken with zero characters left
+        for m in range(1, length + 1):
+            running = np.where(ends, 0.0, probs * reach[m - 1][targets])
+            for edges in by_position:
+                running[edges] += running[edges - 1]
+            totals = running[last]
+            reach.append(totals)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                share = np.where(totals[sources] > 0, running / totals[sources], 1.0)
+            keys.append(sources + share)
+
+        tables = {
+            "offsets": offsets,
+            "nexts": nexts,
+            "chars": "".join(chars),
+            "codepoints": np.array([ord(char) for char in chars], dtype=np.uint32),
+            "reach": reach,
+            "keys": keys,
+        }
+        self._exact[include_symbols] = tables
+        return tables
+
+    def generate_exact(self, length=12, include_symbols=False):
+        """Draws a password of exactly `length` characters in `length` steps, never rejecting."""
+        t = self._exact_tables(length, include_symbols)
+        if t["reach"][length][0] <= 0:
+            raise ValueError(f"The model cannot produce passwords of length {length}.")
+        offsets, nexts, chars = t["offsets"], t["nexts"], t["chars"]
+        state = 0
+        result = []
+        for m in range(length, 0, -1):
+            # clamp below state + 1 so float round-off can never select past the row
+            point = min(state + random.random(), math.nextafter(state + 1.0, 0.0))
+            j = bisect_right(t["keys"][m], point, offsets[state], offsets[state + 1])
+            result.append(chars[j])
+            state = int(nexts[j])
+        return "".join(result)
+
+    def generate_exact_batch(self, count, length=12, include_symbols=False):
+        """Vectorised generate_exact: all chains advance one character per step."""
+        t = self._exact_tables(length, include_symbols)
+        if t["reach"][length][0] <= 0:
+            raise ValueError(f"The model cannot produce passwords of length {length}.")
+        rng = np.random.default_rng()
+        states = np.zeros(count, dtype=np.int64)
+        out = np.zeros((count, length), dtype=np.uint32)
+        for step, m in enumerate(range(length, 0, -1)):
+            points = np.minimum(states + rng.random(count), np.nextafter(states + 1.0, 0.0))
+            edges = np.searchsorted(t["keys"][m], points, side="right")
+            out[:, step] = t["codepoints"][edges]
+            states = t["nexts"][edges]
+        return out.view(f"<U{length}").ravel().tolist() if length else [""] * count
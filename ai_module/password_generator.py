@@ -1,11 +1,178 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: updates are still serialised within a process
+    fcntl = None
+
+from .files import atomic_path
 from .ngram_generator import NGramPasswordGenerator
 
-# Load dataset once
-with open("ai_module/data/passwords.txt", "r") as f:
-    passwords = [line.strip() for line in f if line.strip()]
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CORPUS_PATH = os.environ.get("NGRAM_CORPUS_PATH", os.path.join(DATA_DIR, "passwords.txt"))
+SNAPSHOT_PATH = os.environ.get("NGRAM_MODEL_PATH", os.path.join(DATA_DIR, "ngram_model.bin"))
+WARM_LENGTHS = (12,)  # length tables built before a new model goes live
+# Seconds between checks for a replaced snapshot; 0 disables the watcher.
+MODEL_CHECK_INTERVAL = float(os.environ.get("NGRAM_MODEL_CHECK_INTERVAL", "2"))
+
+_model = None
+_model_lock = threading.Lock()
+_snapshot_stamp = None  # (inode, mtime, size) of the snapshot _model was loaded from
+_watcher = None
+_update_lock = threading.Lock()
+
+def train_model(corpus_path=CORPUS_PATH, n=3):
+    return NGramPasswordGenerator(n=n).train_file(corpus_path)
+
+def _train_shard(corpus_path, start, end, n):
+    """Trains on the lines that begin within bytes [start, end) of the corpus."""
+    model = NGramPasswordGenerator(n=n)
+
+    def lines(f):
+        pos = start
+        if start:
+            f.seek(start - 1)
+            pos += len(f.readline()) - 1  # the line straddling the boundary belongs to the previous shard
+        for line in f:
+            if pos >= end:
+                break
+            pos += len(line)
+            yield line.decode("utf-8", "replace").strip()
+
+    with open(corpus_path, "rb") as f:
+        model.train(filter(None, lines(f)))
+    return model
+
+def train_model_parallel(corpus_path=CORPUS_PATH, n=3, workers=None):
+    """Trains byte-range shards of the corpus in separate processes and merges the partial models."""
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(corpus_path)
+    bounds = [size * i // workers for i in range(workers + 1)]
+    model = NGramPasswordGenerator(n=n)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = [pool.submit(_train_shard, corpus_path, bounds[i], bounds[i + 1], n) for i in range(workers)]
+        for shard in shards:
+            model.merge(shard.result())
+    return model
+
+def get_model():
+    """Loads the compiled snapshot on first use, training from the corpus only if none exists."""
+    global _model, _snapshot_stamp
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                if os.path.exists(SNAPSHOT_PATH):
+                    _snapshot_stamp = _stamp(SNAPSHOT_PATH)
+                    _model = NGramPasswordGenerator.load(SNAPSHOT_PATH)
+                else:
+                    _model = train_model()
+                _start_watcher()
+    return _model
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+def _start_watcher():
+    global _watcher
+    if MODEL_CHECK_INTERVAL > 0 and _watcher is None:
+        _watcher = threading.Thread(target=_watch_snapshot, name="ngram-snapshot-watcher", daemon=True)
+        _watcher.start()
 
-ngram_model = NGramPasswordGenerator(n=3)
-ngram_model.train(passwords)
+def _watch_snapshot():
+    """Reloads the snapshot whenever it is replaced, so every worker process follows the published model."""
+    failed = None
+    while True:
+        time.sleep(MODEL_CHECK_INTERVAL)
+        try:
+            stamp = _stamp(SNAPSHOT_PATH)
+        except OSError:
+            continue  # nothing published yet
+        if stamp in (_snapshot_stamp, failed):
+            continue
+        try:
+            swap_model(NGramPasswordGenerator.load(SNAPSHOT_PATH), stamp)
+        except Exception as e:  # any failure keeps the live model; the watcher itself must keep running
+            failed = stamp  # warn once per bad snapshot, not on every check
+            print(f"⚠️  Keeping the current n-gram model, snapshot reload failed: {e}")
+
+def _warm(model):
+    for length in WARM_LENGTHS:
+        for use_symbols in (False, True):
+            model.generate_exact(length, include_symbols=use_symbols)
+
+def swap_model(model, stamp=None):
+    """Atomically replaces this process's live model; returns the previous one.
+
+    Each generation call reads the module global once, so requests already
+    sampling from the old model finish on it while new ones see the new model.
+    The new model's length tables are built first so no request pays for them;
+    a model that cannot produce those lengths raises ValueError and is not swapped in.
+    `stamp` identifies the snapshot file the model came from, if any.
+    """
+    global _model, _snapshot_stamp
+    _warm(model)
+    with _model_lock:
+        previous, _model = _model, model
+        _snapshot_stamp = stamp
+    return previous
+
+@contextmanager
+def _publish_lock():
+    """Serialises snapshot updates across threads and, where flock exists, across worker processes."""
+    with _update_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(SNAPSHOT_PATH + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def save_snapshot(model, path=None):
+    """Publishes a snapshot (default: SNAPSHOT_PATH) atomically, so workers never map a half-written file."""
+    with atomic_path(path or SNAPSHOT_PATH) as tmp_path:
+        model.save(tmp_path)
+
+def reload_model(snapshot_path=None):
+    """Swaps in the published snapshot, first publishing `snapshot_path` over it if given.
+
+    Other worker processes pick the new snapshot up within MODEL_CHECK_INTERVAL.
+    """
+    with _publish_lock():
+        if snapshot_path and os.path.abspath(snapshot_path) != os.path.abspath(SNAPSHOT_PATH):
+            model = NGramPasswordGenerator.load(snapshot_path)
+            _warm(model)  # never publish a model that cannot serve the default lengths
+            save_snapshot(model)
+        model = NGramPasswordGenerator.load(SNAPSHOT_PATH)
+        swap_model(model, _stamp(SNAPSHOT_PATH))
+    return model
+
+def update_model(corpus_paths):
+    """Adds new corpus files to a copy of the published model, publishes it and swaps it in.
+
+    Updates are serialised and each starts from the latest published
+    snapshot, so concurrent updates, from this or another worker, all land.
+    The live model is never mutated.
+    """
+    with _publish_lock():
+        current = NGramPasswordGenerator.load(SNAPSHOT_PATH) if os.path.exists(SNAPSHOT_PATH) else get_model()
+        model = NGramPasswordGenerator(n=current.n).merge(current)
+        for path in corpus_paths:
+            model.train_file(path)
+        _warm(model)
+        save_snapshot(model)
+        swap_model(model, _stamp(SNAPSHOT_PATH))
+    return model
 
 def generate_password(length=12, use_symbols=True):
-    return ngram_model.generate(max_length=length, min_length=8, include_symbols=use_symbols)
\ No newline at end of file
+    return get_model().generate_exact(length, include_symbols=use_symbols)
+
+def generate_batch(count, length=12, use_symbols=True):
+    return get_model().generate_exact_batch(count, length, include_symbols=use_symbols)
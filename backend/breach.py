@@ -0,0 +1,152 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+from ai_module.files import atomic_path
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ai_module", "data")
+BREACH_CORPUS_PATH = os.environ.get("BREACH_CORPUS_PATH", os.path.join(DATA_DIR, "passwords.txt"))
+BREACH_INDEX_PATH = os.environ.get("BREACH_INDEX_PATH", os.path.join(DATA_DIR, "breach_index.bin"))
+# Seconds between checks for an index that was missing or unreadable.
+BREACH_INDEX_CHECK_INTERVAL = float(os.environ.get("BREACH_INDEX_CHECK_INTERVAL", "60"))
+
+# Index layout (native byte order): header, a directory of 2**16 + 1 uint64
+# offsets keyed by the top 16 bits of each hash, then the sorted, unique
+# 64-bit hashes. A lookup is one directory read plus a bisect within a bucket.
+INDEX_MAGIC = b"BRCH"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("=4sIQ")
+DIRECTORY_BITS = 16
+BUILD_BUCKETS = 256  # on-disk partitions while building; one is sorted in memory at a time
+HASH_CHUNK = 1_000_000
+
+
+def password_hash(password: str) -> int:
+    return int.from_bytes(hashlib.blake2b(password.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "big")
+
+
+def read_corpus(paths):
+    """Streams the passwords in one-per-line corpus files; only line endings are stripped."""
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.rstrip("\r\n")
+                if line:
+                    yield line
+
+
+def build_index(passwords, path, tmp_dir=None):
+    """Writes an index for an iterable of passwords, streaming it through bucket files on disk.
+
+    The result is renamed over `path` only once complete, so concurrent
+    builders and running readers never see a partial file.
+    """
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as work:
+        buckets = [open(os.path.join(work, f"{b}.bin"), "wb") for b in range(BUILD_BUCKETS)]
+
+        def flush(chunk):
+            hashes = np.frombuffer(chunk, dtype=np.uint64)
+            owners = (hashes >> np.uint64(64 - 8)).astype(np.int64)
+            order = np.argsort(owners, kind="stable")
+            hashes, owners = hashes[order], owners[order]
+            bounds = np.searchsorted(owners, np.arange(BUILD_BUCKETS + 1))
+            for b in range(BUILD_BUCKETS):
+                if bounds[b] < bounds[b + 1]:
+                    buckets[b].write(hashes[bounds[b]:bounds[b + 1]].tobytes())
+
+        chunk = array("Q")
+        for password in passwords:
+            chunk.append(password_hash(password))
+            if len(chunk) >= HASH_CHUNK:
+                flush(chunk)
+                chunk = array("Q")
+        flush(chunk)
+        for bucket in buckets:
+            bucket.close()
+
+        directory = np.zeros(2 ** DIRECTORY_BITS + 1, dtype=np.uint64)
+        with atomic_path(path) as tmp_path, open(tmp_path, "wb") as out:
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0))
+            out.write(directory.tobytes())  # rewritten once the counts are known
+            count = 0
+            for b in range(BUILD_BUCKETS):
+                hashes = np.unique(np.fromfile(os.path.join(work, f"{b}.bin"), dtype=np.uint64))
+                prefixes = (hashes >> np.uint64(64 - DIRECTORY_BITS)).astype(np.int64)
+                directory += np.bincount(prefixes, minlength=2 ** DIRECTORY_BITS + 1).astype(np.uint64)
+                out.write(hashes.tobytes())
+                count += len(hashes)
+            # bincount gave per-prefix sizes; the directory stores running starts
+            directory = np.concatenate(([0], np.cumsum(directory[:-1]))).astype(np.uint64)
+            out.seek(0)
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, count))
+            out.write(directory.tobytes())
+    return count
+
+
+class BreachIndex:
+    """Read-only, memory-mapped membership test over a built index."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = INDEX_HEADER.unpack_from(self._mmap)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} breach index")
+        view = memoryview(self._mmap)
+        start = INDEX_HEADER.size
+        directory_end = start + (2 ** DIRECTORY_BITS + 1) * 8
+        self._directory = view[start:directory_end].cast("Q")
+        self._hashes = view[directory_end:directory_end + count * 8].cast("Q")
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, password):
+        h = password_hash(password)
+        prefix = h >> (64 - DIRECTORY_BITS)
+        lo, hi = self._directory[prefix], self._directory[prefix + 1]
+        i = bisect_left(self._hashes, h, lo, hi)
+        return i < hi and self._hashes[i] == h
+
+    def contains_many(self, passwords):
+        """Vectorised membership for a batch; returns a list of bools."""
+        if not passwords or not self.count:
+            return [False] * len(passwords)
+        hashes = np.array([password_hash(password) for password in passwords], dtype=np.uint64)
+        table = np.frombuffer(self._hashes, dtype=np.uint64)
+        positions = np.searchsorted(table, hashes).clip(max=self.count - 1)
+        return (table[positions] == hashes).tolist()
+
+
+_index = None
+_index_lock = threading.Lock()
+_next_check = 0.0  # monotonic time before which a missing index is not looked for again
+
+
+def get_breach_index():
+    """Opens the breach index built by scripts/build_breach_index.py on first use.
+
+    The index is never built here: on a large corpus that takes minutes and
+    would run on the request path. Returns None (checks disabled) until an
+    index exists; a missing index is looked for again at most once every
+    BREACH_INDEX_CHECK_INTERVAL seconds, not on every request.
+    """
+    global _index, _next_check
+    if _index is None and time.monotonic() >= _next_check:
+        with _index_lock:
+            if _index is None and time.monotonic() >= _next_check:
+                try:
+                    _index = BreachIndex(BREACH_INDEX_PATH)
+                except (OSError, ValueError):
+                    _next_check = time.monotonic() + BREACH_INDEX_CHECK_INTERVAL
+    return _index
@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+
+# Column names used by common password-manager CSV exports (Chrome, Firefox,
+# Bitwarden, LastPass, 1Password, KeePass), checked in order, lower-cased.
+SITE_COLUMNS = ("url", "login_uri", "website", "web site", "origin", "name", "title")
+PASSWORD_COLUMNS = ("password", "login_password")
+
+
+def _pick(row, columns, strip=True):
+    for column in columns:
+        value = row.get(column)
+        if value and strip:
+            value = value.strip()
+        if value:
+            return value
+    return None
+
+
+def _text(value, strip=True):
+    """Normalises a JSON value to text; numbers are kept, anything else becomes None."""
+    if isinstance(value, str):
+        return (value.strip() if strip else value) or None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return None
+
+
+def parse_csv(text_stream):
+    """Yields {"site", "password"} per data row, reading `text_stream` lazily."""
+    reader = csv.DictReader(text_stream)
+    if reader.fieldnames is None:
+        return
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    for row in reader:
+        # Sites are trimmed; passwords are kept byte-for-byte, surrounding spaces included.
+        yield {"site": _pick(row, SITE_COLUMNS), "password": _pick(row, PASSWORD_COLUMNS, strip=False)}
+
+
+def parse_json(text_stream):
+    """Accepts a Bitwarden-style {"items": [...]} export or a plain list of {"site", "password"}."""
+    data = json.load(text_stream)
+    items = data.get("items", []) if isinstance(data, dict) else data
+    for item in items:
+        if not isinstance(item, dict):
+            yield {"site": None, "password": None}
+            continue
+        login = item.get("login") or {}
+        uris = login.get("uris") or []
+        site = item.get("site") or (uris[0].get("uri") if uris else None) or item.get("name")
+        yield {"site": _text(site), "password": _text(item.get("password") or login.get("password"), strip=False)}
+
+
+PARSERS = {"csv": parse_csv, "json": parse_json}
+
+
+def parse_export(binary_stream, fmt):
+    text_stream = io.TextIOWrapper(binary_stream, encoding="utf-8-sig", newline="")
+    return PARSERS[fmt](text_stream)
@@ -0,0 +1,95 @@
+import asyncio
+import base64
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from fastapi import HTTPException
+
+from backend.metrics import span
+
+# argon2-cffi and OpenSSL release the GIL while hashing, so threads scale
+# across cores; KDF_EXECUTOR=process is available for builds where they don't
+# (spans recorded inside worker processes are not exported by /metrics).
+KDF_EXECUTOR = os.environ.get("KDF_EXECUTOR", "thread")
+KDF_WORKERS = int(os.environ.get("KDF_WORKERS", str(os.cpu_count() or 1)))
+KDF_MAX_PENDING = int(os.environ.get("KDF_MAX_PENDING", str(KDF_WORKERS * 8)))
+# PBKDF2 cost for wrapping data keys; raising it upgrades users on their next unlock.
+KDF_ITERATIONS = int(os.environ.get("KDF_ITERATIONS", "100000"))
+LEGACY_KDF_ITERATIONS = 100_000  # rows encrypted before envelope encryption
+
+ph = PasswordHasher()
+
+def hash_password(password: str) -> str:
+    with span("argon2.hash"):
+        return ph.hash(password)
+
+def verify_password(hashed_password: str, password: str) -> bool:
+    with span("argon2.verify"):
+        try:
+            return ph.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+def derive_key(master_password: str, salt: bytes, iterations: int = LEGACY_KDF_ITERATIONS) -> bytes:
+    """Derives a 256-bit AES key from the master password."""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=iterations,
+    )
+    with span("pbkdf2.derive_key"):
+        return kdf.derive(master_password.encode())
+
+def wrap_data_key(data_key: bytes, master_password: str, iterations: int = KDF_ITERATIONS) -> dict:
+    """Wraps `data_key` under a key derived from the master password with a fresh random salt."""
+    salt = os.urandom(16)
+    nonce = os.urandom(12)
+    wrapped = AESGCM(derive_key(master_password, salt, iterations)).encrypt(nonce, data_key, None)
+    return {
+        "kdf_salt": base64.b64encode(salt).decode(),
+        "kdf_iterations": iterations,
+        "wrapped_key": base64.b64encode(nonce + wrapped).decode()
+    }
+
+def create_envelope(master_password: str) -> tuple[bytes, dict]:
+    """Creates a random per-user data key and its wrapped form for the User row."""
+    data_key = os.urandom(32)
+    return data_key, wrap_data_key(data_key, master_password)
+
+def unwrap_data_key(kdf_salt: str, kdf_iterations: int, wrapped_key: str, master_password: str) -> bytes:
+    kek = derive_key(master_password, base64.b64decode(kdf_salt), kdf_iterations)
+    blob = base64.b64decode(wrapped_key)
+    return AESGCM(kek).decrypt(blob[:12], blob[12:], None)
+
+
+class KDFPool:
+    """Runs slow KDF calls off the event loop, rejecting work beyond `max_pending` with a 503."""
+
+    def __init__(self, kind=KDF_EXECUTOR, workers=KDF_WORKERS, max_pending=KDF_MAX_PENDING):
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        elif kind == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kdf")
+        else:
+            raise ValueError(f"Unknown KDF_EXECUTOR {kind!r}, expected 'thread' or 'process'.")
+        self.max_pending = max_pending
+        self.pending = 0  # only touched from the event loop thread
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(status_code=503, detail="Server busy, please retry.", headers={"Retry-After": "1"})
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
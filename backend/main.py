@@ -1,23 +1,42 @@
-from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi import FastAPI, HTTPException, Query, Depends, Header, Request
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from argon2 import PasswordHasher
 
 import os
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 
-from ai_module.password_generator import generate_password
+from ai_module.password_generator import generate_password, generate_batch, reload_model, update_model
+from backend.metrics import METRICS_ENABLED, MetricsMiddleware, profiler, registry, span, timed
 
-import math
+import json
 
 from backend.database import engine, SessionLocal
-from backend.models import Base, User, PasswordVault
+from backend.migrations import run_migrations
+from backend.models import User, PasswordVault
+from backend.sessions import SessionCache
+from backend.kdf import (
+    KDFPool, KDF_ITERATIONS, hash_password, verify_password, derive_key,
+    create_envelope, wrap_data_key, unwrap_data_key,
+)
+from backend.importers import parse_export
+from backend.strength import score_password, score_passwords
+from backend.breach import get_breach_index
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+import tempfile
+import csv
+import asyncio
+import threading
+import hmac
 from passlib.hash import bcrypt
 
-Base.metadata.create_all(bind=engine)
+generate_password = timed("ngram.generate_password", generate_password)
+generate_batch = timed("ngram.generate_batch", generate_batch)
+
+if os.environ.get("RUN_MIGRATIONS_ON_STARTUP", "1") == "1":
+    run_migrations(engine)
 
 
 app = FastAPI()
@@ -32,7 +51,26 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-ph = PasswordHasher()
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+sessions = SessionCache()
+kdf_pool = KDFPool()
+registry.gauge("kdf_pool_pending", lambda: kdf_pool.pending, "KDF calls running or queued.")
+registry.gauge("sessions_active", lambda: len(sessions), "Cached vault sessions.")
+
+MAX_JSON_BATCH = 10_000  # larger batches must be streamed as NDJSON
+STREAM_CHUNK = 1_000
+VAULT_PAGE_SIZE = 50
+VAULT_YIELD_PER = 500
+MAX_BULK_ENTRIES = 10_000
+MAX_IMPORT_BYTES = 20 * 2**20
+INSERT_CHUNK = 500
+MIGRATION_CHUNK = 200
+MAX_STRENGTH_BATCH = 100_000
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")  # enables the /admin endpoints when set
+
+_migrating = set()  # user ids with a legacy-row migration in flight
+_migrating_lock = threading.Lock()
 
 def get_db():
     db = SessionLocal()
@@ -51,34 +89,47 @@ class LoginRequest(BaseModel):
     password: str
 
 class StorePasswordRequest(BaseModel):
-    email: str
-    master_password: str
+    email: str | None = None  # Optional when authenticating with a session token
+    master_password: str | None = None
     site: str
     password: str | None = None  # Optional if use_ai is True
     use_ai: bool = False
 
-class RetrievePasswordsRequest(BaseModel):
+class VaultEntry(BaseModel):
+    site: str
+    password: str | None = None
+    use_ai: bool = False
+
+class StorePasswordsRequest(BaseModel):
+    email: str | None = None
+    master_password: str | None = None
+    entries: list[VaultEntry]
+
+class ChangeMasterPasswordRequest(BaseModel):
     email: str
     master_password: str
+    new_master_password: str
+
+class RetrievePasswordsRequest(BaseModel):
+    email: str | None = None
+    master_password: str | None = None
 
 class PasswordStrengthRequest(BaseModel):
     password: str
 
-def derive_key(master_password: str, salt: bytes) -> bytes:
-    """Derives a 256-bit AES key from the master password."""
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=salt,
-        iterations=100_000,
-    )
-    return kdf.derive(master_password.encode())
+class ReloadModelRequest(BaseModel):
+    snapshot_path: str | None = None  # published over NGRAM_MODEL_PATH; omit to reload that file
+    corpus_paths: list[str] = []  # if given, trained into a copy of the published model instead
+
+class PasswordStrengthBatchRequest(BaseModel):
+    passwords: list[str]
 
 def encrypt_password(password: str, key: bytes) -> dict:
     """Encrypts a password using AES-GCM."""
     aesgcm = AESGCM(key)
     nonce = os.urandom(12)
-    ciphertext = aesgcm.encrypt(nonce, password.encode(), None)
+    with span("aes.encrypt"):
+        ciphertext = aesgcm.encrypt(nonce, password.encode(), None)
     return {
         "nonce": base64.b64encode(nonce).decode(),
         "ciphertext": base64.b64encode(ciphertext).decode()
@@ -89,43 +140,269 @@ def decrypt_password(enc_data: dict, key: bytes) -> str:
     aesgcm = AESGCM(key)
     nonce = base64.b64decode(enc_data["nonce"])
     ciphertext = base64.b64decode(enc_data["ciphertext"])
-    return aesgcm.decrypt(nonce, ciphertext, None).decode()
+    with span("aes.decrypt"):
+        return aesgcm.decrypt(nonce, ciphertext, None).decode()
+
+def entry_key(entry: PasswordVault, key: bytes, legacy_key: bytes | None) -> bytes:
+    """Picks the data key, or the legacy key for rows not yet migrated to envelope encryption."""
+    if entry.encrypted_with_data_key:
+        return key
+    if legacy_key is None:
+        raise HTTPException(status_code=409, detail="Vault migration pending, please log in again.")
+    return legacy_key
+
+def vault_item(entry: PasswordVault, key: bytes, legacy_key: bytes | None = None) -> dict:
+    enc_data = {"nonce": entry.nonce, "ciphertext": entry.encrypted_password}
+    password = decrypt_password(enc_data, entry_key(entry, key, legacy_key))
+    return {"id": entry.id, "site": entry.site, "password": password}
+
+def encrypt_passwords(passwords: list[str], key: bytes) -> list[dict]:
+    """Encrypts many passwords with one AES-GCM context and one urandom call."""
+    aesgcm = AESGCM(key)
+    nonces = os.urandom(12 * len(passwords))
+    results = []
+    for i, password in enumerate(passwords):
+        nonce = nonces[12 * i:12 * (i + 1)]
+        with span("aes.encrypt"):
+            ciphertext = aesgcm.encrypt(nonce, password.encode(), None)
+        results.append({
+            "nonce": base64.b64encode(nonce).decode(),
+            "ciphertext": base64.b64encode(ciphertext).decode()
+        })
+    return results
+
+def generated(fn, *args):
+    """Calls a generator function, turning lengths the model cannot produce into a 422.
+
+    Handlers run it via run_in_threadpool: the first call may load or train the
+    model, and each new length builds its sampling tables.
+    """
+    try:
+        return fn(*args)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def store_entries(entries, user_id: int, key: bytes, db: Session) -> list[dict]:
+    """Encrypts and bulk-inserts (site, password, use_ai) entries in one transaction."""
+    entries = list(entries)
+    if len(entries) > MAX_BULK_ENTRIES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ENTRIES} entries per request.")
+    ai_passwords = iter(generated(generate_batch, sum(1 for _, _, use_ai in entries if use_ai), 12, True))
+
+    results, pending = [], []
+    for index, (site, password, use_ai) in enumerate(entries):
+        if not site:
+            results.append({"index": index, "site": site, "status": "error", "detail": "Site is required."})
+            continue
+        if use_ai:
+            password = next(ai_passwords)
+        elif not password:
+            results.append({"index": index, "site": site, "status": "error", "detail": "Password is required if use_ai is false."})
+            continue
+        results.append({"index": index, "site": site, "status": "stored", "password": password if use_ai else None})
+        pending.append((site, password))
+
+    rows = [
+        {
+            "user_id": user_id,
+            "site": site,
+            "nonce": enc["nonce"],
+            "encrypted_password": enc["ciphertext"],
+            "encrypted_with_data_key": True
+        }
+        for (site, _), enc in zip(pending, encrypt_passwords([password for _, password in pending], key))
+    ]
+    try:
+        for start in range(0, len(rows), INSERT_CHUNK):
+            db.execute(insert(PasswordVault), rows[start:start + INSERT_CHUNK])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return results
+
+# Handlers are async so they can await kdf_pool, but every SQLAlchemy call is
+# blocking (a commit can wait out SQLite's busy_timeout), so DB work goes
+# through these helpers via run_in_threadpool and never runs on the event loop.
+def find_user(email: str, db: Session) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+def save(db: Session, *objects):
+    """Commits, then reloads `objects` so later attribute reads don't query from the event loop."""
+    db.add_all(objects)
+    db.commit()
+    for obj in objects:
+        db.refresh(obj)
+
+def update_envelope(user: User, values: dict, expected_wrapped_key: str | None, db: Session) -> bool:
+    """Writes envelope fields only if the stored wrapped key is still `expected_wrapped_key`, then reloads `user`.
+
+    Concurrent enrollments would otherwise each persist a different data key,
+    with legacy rows migrated under whichever one lost.
+    """
+    unchanged = User.wrapped_key.is_(None) if expected_wrapped_key is None else User.wrapped_key == expected_wrapped_key
+    updated = db.query(User).filter(User.id == user.id, unchanged).update(values, synchronize_session=False)
+    db.commit()
+    db.refresh(user)
+    return updated == 1
+
+def has_legacy_rows(user_id: int, db: Session) -> bool:
+    return db.query(PasswordVault.id).filter(
+        PasswordVault.user_id == user_id, PasswordVault.encrypted_with_data_key == False
+    ).first() is not None
+
+def migrate_legacy_rows(user_id: int, legacy_key: bytes, data_key: bytes, chunk_size: int = MIGRATION_CHUNK) -> int:
+    """Re-encrypts a user's legacy rows under their data key, one short transaction per chunk."""
+    with _migrating_lock:
+        if user_id in _migrating:
+            return 0
+        _migrating.add(user_id)
+    migrated = 0
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                rows = (
+                    db.query(PasswordVault)
+                    .filter(PasswordVault.user_id == user_id, PasswordVault.encrypted_with_data_key == False)
+                    .order_by(PasswordVault.id)
+                    .limit(chunk_size)
+                    .all()
+                )
+                if not rows:
+                    break
+                for row in rows:
+                    password = decrypt_password({"nonce": row.nonce, "ciphertext": row.encrypted_password}, legacy_key)
+                    enc = encrypt_password(password, data_key)
+                    row.nonce = enc["nonce"]
+                    row.encrypted_password = enc["ciphertext"]
+                    row.encrypted_with_data_key = True
+                db.commit()
+                migrated += len(rows)
+            finally:
+                db.close()
+    finally:
+        with _migrating_lock:
+            _migrating.discard(user_id)
+    return migrated
+
+async def unlock_vault(user: User, master_password: str, db: Session):
+    """Verifies the master password and returns (data_key, legacy_key), or None if it is wrong.
+
+    Users without an envelope are enrolled, and envelopes below KDF_ITERATIONS
+    are rewrapped; both touch only the User row. legacy_key is derived only
+    while the user still has rows encrypted the old way.
+    """
+    if not await kdf_pool.run(verify_password, user.hashed_password, master_password):
+        return None
+    if user.wrapped_key is None:
+        data_key, envelope = await kdf_pool.run(create_envelope, master_password)
+        if not await run_in_threadpool(update_envelope, user, envelope, None, db):
+            # Another request enrolled first; only its key is persisted.
+            data_key = await kdf_pool.run(unwrap_data_key, user.kdf_salt, user.kdf_iterations, user.wrapped_key, master_password)
+    else:
+        data_key = await kdf_pool.run(unwrap_data_key, user.kdf_salt, user.kdf_iterations, user.wrapped_key, master_password)
+        if user.kdf_iterations < KDF_ITERATIONS:
+            envelope = await kdf_pool.run(wrap_data_key, data_key, master_password, KDF_ITERATIONS)
+            # Losing this race is fine: the winner wrapped the same data key.
+            await run_in_threadpool(update_envelope, user, envelope, user.wrapped_key, db)
+    legacy_key = None
+    if await run_in_threadpool(has_legacy_rows, user.id, db):
+        legacy_key = await kdf_pool.run(derive_key, master_password, user.email.encode())
+    return data_key, legacy_key
+
+def start_migration(user_id: int, legacy_key: bytes | None, data_key: bytes):
+    if legacy_key is not None:
+        asyncio.get_running_loop().run_in_executor(None, migrate_legacy_rows, user_id, legacy_key, data_key)
+
+def bearer_token(authorization: str | None) -> str | None:
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+    return None
+
+async def authenticate_vault(email, master_password, authorization, db):
+    """Resolves (user_id, data_key, legacy_key) from a session token, or from email + master password."""
+    token = bearer_token(authorization)
+    if token:
+        session = sessions.get(token)
+        if session is None:
+            raise HTTPException(status_code=401, detail="Session expired or invalid.")
+        legacy_key = bytes(session.legacy_key) if session.legacy_key is not None else None
+        return session.user_id, bytes(session.key), legacy_key
+    if not email or not master_password:
+        raise HTTPException(status_code=401, detail="Session token or email and master password required.")
+    user = await run_in_threadpool(find_user, email, db)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found.")
+    keys = await unlock_vault(user, master_password, db)
+    if keys is None:
+        raise HTTPException(status_code=401, detail="Invalid master password.")
+    start_migration(user.id, keys[1], keys[0])
+    return user.id, *keys
 
 @app.post("/register")
-def register(req: RegisterRequest, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == req.email).first()
+async def register(req: RegisterRequest, db: Session = Depends(get_db)):
+    existing_user = await run_in_threadpool(find_user, req.email, db)
     if existing_user:
         raise HTTPException(status_code=400, detail="User already exists.")
-    hashed_password = ph.hash(req.password)
-    new_user = User(email=req.email, hashed_password=hashed_password)
-    db.add(new_user)
-    db.commit()
+    hashed_password = await kdf_pool.run(hash_password, req.password)
+    _, envelope = await kdf_pool.run(create_envelope, req.password)
+    new_user = User(email=req.email, hashed_password=hashed_password, **envelope)
+    await run_in_threadpool(save, db, new_user)
     return {"message": "User registered successfully."}
 
 @app.post("/login")
-def login(req: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == req.email).first()
+async def login(req: LoginRequest, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(find_user, req.email, db)
     if not user:
         raise HTTPException(status_code=401, detail="User not found.")
-    try:
-        ph.verify(user.hashed_password, req.password)
-    except:
+    keys = await unlock_vault(user, req.password, db)
+    if keys is None:
         raise HTTPException(status_code=401, detail="Incorrect password.")
-    return {"message": "Login successful."}
-
-@app.post("/store-password")
-def store_password(req: StorePasswordRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == req.email).first()
+    data_key, legacy_key = keys
+    start_migration(user.id, legacy_key, data_key)
+    sessions.purge_expired()
+    token = sessions.create(user.id, user.email, data_key, legacy_key)
+    return {"message": "Login successful.", "token": token, "expires_in": sessions.ttl}
+
+@app.post("/logout")
+async def logout(authorization: str | None = Header(None)):
+    token = bearer_token(authorization)
+    if not token or not sessions.revoke(token):
+        raise HTTPException(status_code=401, detail="Session expired or invalid.")
+    return {"message": "Logged out."}
+
+@app.post("/change-master-password")
+async def change_master_password(req: ChangeMasterPasswordRequest, db: Session = Depends(get_db)):
+    """Rewraps the data key under the new password; vault rows are not re-encrypted."""
+    user = await run_in_threadpool(find_user, req.email, db)
     if not user:
         raise HTTPException(status_code=401, detail="User not found.")
-    try:
-        ph.verify(user.hashed_password, req.master_password)
-    except:
+    keys = await unlock_vault(user, req.master_password, db)
+    if keys is None:
         raise HTTPException(status_code=401, detail="Invalid master password.")
-    salt = req.email.encode()  # simple static salt for now
-    key = derive_key(req.master_password, salt)
+    data_key, legacy_key = keys
+    if legacy_key is not None:
+        # Legacy rows are keyed by the old password, so they must move first.
+        await run_in_threadpool(migrate_legacy_rows, user.id, legacy_key, data_key)
+        if await run_in_threadpool(has_legacy_rows, user.id, db):
+            raise HTTPException(status_code=409, detail="Vault migration in progress, please retry shortly.")
+    wrapped_key = user.wrapped_key
+    values = {"hashed_password": await kdf_pool.run(hash_password, req.new_master_password)}
+    values.update(await kdf_pool.run(wrap_data_key, data_key, req.new_master_password))
+    if not await run_in_threadpool(update_envelope, user, values, wrapped_key, db):
+        raise HTTPException(status_code=409, detail="Master password changed concurrently, please retry.")
+    return {"message": "Master password changed."}
+
+@app.post("/store-password")
+async def store_password(
+    req: StorePasswordRequest,
+    authorization: str | None = Header(None),
+    db: Session = Depends(get_db)
+):
+    user_id, key, _ = await authenticate_vault(req.email, req.master_password, authorization, db)
     if req.use_ai:
-        password_to_store = generate_password(length=12)
+        password_to_store = await run_in_threadpool(generated, generate_password, 12)
     elif req.password:
         password_to_store = req.password
     else:
@@ -134,14 +411,14 @@ def store_password(req: StorePasswordRequest, db: Session = Depends(get_db)):
     enc = encrypt_password(password_to_store, key)
 
     vault_entry = PasswordVault(
-        user_id=user.id,
+        user_id=user_id,
         site=req.site,
         nonce=enc["nonce"],
-        encrypted_password=enc["ciphertext"]
+        encrypted_password=enc["ciphertext"],
+        encrypted_with_data_key=True
     )
 
-    db.add(vault_entry)
-    db.commit()
+    await run_in_threadpool(save, db, vault_entry)
 
     return {
         "message": "Password stored securely.",
@@ -149,70 +426,200 @@ def store_password(req: StorePasswordRequest, db: Session = Depends(get_db)):
         "password": password_to_store if req.use_ai else None
     }
 
-@app.post("/retrieve-passwords")
-def retrieve_passwords(req: RetrievePasswordsRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == req.email).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found.")
+@app.post("/store-passwords")
+async def store_passwords(
+    req: StorePasswordsRequest,
+    authorization: str | None = Header(None),
+    db: Session = Depends(get_db)
+):
+    user_id, key, _ = await authenticate_vault(req.email, req.master_password, authorization, db)
+    entries = [(entry.site, entry.password, entry.use_ai) for entry in req.entries]
+    results = await run_in_threadpool(store_entries, entries, user_id, key, db)
+    stored = sum(1 for result in results if result["status"] == "stored")
+    return {"message": f"Stored {stored} of {len(results)} passwords.", "stored": stored, "results": results}
+
+@app.post("/import-passwords")
+async def import_passwords(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|json)$"),
+    authorization: str | None = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Imports a password-manager CSV/JSON export sent as the raw request body."""
+    user_id, key, _ = await authenticate_vault(None, None, authorization, db)
+    upload = tempfile.SpooledTemporaryFile(max_size=2**20)  # spills large exports to disk
     try:
-        ph.verify(user.hashed_password, req.master_password)
-    except:
-        raise HTTPException(status_code=401, detail="Invalid master password.")
-
-    salt = req.email.encode()
-    key = derive_key(req.master_password, salt)
-
-    vault_entries = db.query(PasswordVault).filter(PasswordVault.user_id == user.id).all()
-    if not vault_entries:
-        return {"passwords": []}
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > MAX_IMPORT_BYTES:
+                raise HTTPException(status_code=413, detail="Import file too large.")
+            upload.write(chunk)
+        upload.seek(0)
+        try:
+            entries = [(item["site"], item["password"], False) for item in parse_export(upload, format)]
+        except (ValueError, TypeError, AttributeError, csv.Error) as e:
+            raise HTTPException(status_code=400, detail=f"Could not parse {format} export: {e}")
+        results = await run_in_threadpool(store_entries, entries, user_id, key, db)
+    finally:
+        upload.close()
+    stored = sum(1 for result in results if result["status"] == "stored")
+    return {"message": f"Imported {stored} of {len(results)} passwords.", "stored": stored, "results": results}
 
-    results = []
-    for entry in vault_entries:
-        enc_data = {"nonce": entry.nonce, "ciphertext": entry.encrypted_password}
-        decrypted = decrypt_password(enc_data, key)
-        results.append({
-            "site": entry.site,
-            "password": decrypted
-        })
-    return {"passwords": results}
+@app.post("/retrieve-passwords")
+async def retrieve_passwords(
+    req: RetrievePasswordsRequest,
+    authorization: str | None = Header(None),
+    db: Session = Depends(get_db)
+):
+    user_id, key, legacy_key = await authenticate_vault(req.email, req.master_password, authorization, db)
+
+    def read_vault():
+        vault_entries = db.query(PasswordVault).filter(PasswordVault.user_id == user_id).all()
+        results = []
+        for entry in vault_entries:
+            enc_data = {"nonce": entry.nonce, "ciphertext": entry.encrypted_password}
+            decrypted = decrypt_password(enc_data, entry_key(entry, key, legacy_key))
+            results.append({
+                "site": entry.site,
+                "password": decrypted
+            })
+        return results
+
+    return {"passwords": await run_in_threadpool(read_vault)}
+
+@app.get("/vault")
+async def list_vault(
+    limit: int = Query(VAULT_PAGE_SIZE, ge=1, le=1000),
+    after: int = Query(0, ge=0),
+    stream: bool = False,
+    authorization: str | None = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Keyset-paginated vault listing (pass next_after back as after), or NDJSON of the whole vault with stream=true."""
+    user_id, key, legacy_key = await authenticate_vault(None, None, authorization, db)
+    query = (
+        db.query(PasswordVault)
+        .filter(PasswordVault.user_id == user_id, PasswordVault.id > after)
+        .order_by(PasswordVault.id)
+    )
+    if not stream:
+        entries = await run_in_threadpool(query.limit(limit).all)
+        return {
+            "passwords": [vault_item(entry, key, legacy_key) for entry in entries],
+            "next_after": entries[-1].id if len(entries) == limit else None
+        }
+
+    def ndjson():
+        # The request's session may be closed before streaming starts, so rows
+        # are read through a dedicated one and decrypted as they are sent.
+        # Starlette iterates sync generators in its threadpool.
+        stream_db = SessionLocal()
+        try:
+            rows = (
+                stream_db.query(PasswordVault)
+                .filter(PasswordVault.user_id == user_id, PasswordVault.id > after)
+                .order_by(PasswordVault.id)
+                .yield_per(VAULT_YIELD_PER)
+            )
+            for entry in rows:
+                yield json.dumps(vault_item(entry, key, legacy_key)) + "\n"
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@app.get("/vault/{site:path}")
+async def get_vault_entry(
+    site: str,
+    authorization: str | None = Header(None),
+    db: Session = Depends(get_db)
+):
+    user_id, key, legacy_key = await authenticate_vault(None, None, authorization, db)
+    entry = await run_in_threadpool(
+        db.query(PasswordVault)
+        .filter(PasswordVault.user_id == user_id, PasswordVault.site == site)
+        .order_by(PasswordVault.id.desc())
+        .first
+    )
+    if not entry:
+        raise HTTPException(status_code=404, detail="No password stored for this site.")
+    return vault_item(entry, key, legacy_key)
 
 @app.get("/generate-password")
-def generate_password_route(
+async def generate_password_route(
     length: int = Query(12, ge=8, le=32),
     use_symbols: bool = True
 ):
-    password = generate_password(length, use_symbols)
+    password = await run_in_threadpool(generated, generate_password, length, use_symbols)
     return {"password": password}
 
-@app.post("/evaluate-strength")
-def evaluate_strength(req: PasswordStrengthRequest):
-    pwd = req.password
-    length = len(pwd)
-
-    # Determine character pool size
-    pool = 0
-    if any(c.islower() for c in pwd):
-        pool += 26
-    if any(c.isupper() for c in pwd):
-        pool += 26
-    if any(c.isdigit() for c in pwd):
-        pool += 10
-    if any(not c.isalnum() for c in pwd):
-        pool += 32
-
-    entropy = round(length * math.log2(pool)) if pool > 0 else 0
-
-    # Rating scale
-    if entropy < 40:
-        rating = "Weak"
-    elif entropy < 60:
-        rating = "Moderate"
-    else:
-        rating = "Strong"
+@app.get("/generate-passwords")
+async def generate_passwords_route(
+    count: int = Query(10, ge=1, le=1_000_000),
+    length: int = Query(12, ge=8, le=32),
+    use_symbols: bool = True,
+    stream: bool = False
+):
+    if not stream:
+        if count > MAX_JSON_BATCH:
+            raise HTTPException(status_code=400, detail=f"Use stream=true for more than {MAX_JSON_BATCH} passwords.")
+        return {"passwords": await run_in_threadpool(generated, generate_batch, count, length, use_symbols)}
 
-    return {
-        "length": length,
-        "character_pool_size": pool,
-        "entropy_bits": entropy,
-        "rating": rating
-    }
\ No newline at end of file
+    # The first chunk is drawn before the response starts so an impossible length is still a 422.
+    first = await run_in_threadpool(generated, generate_batch, min(count, STREAM_CHUNK), length, use_symbols)
+
+    def ndjson():
+        batch, remaining = first, count - len(first)
+        while True:
+            yield "".join(json.dumps({"password": password}) + "\n" for password in batch)
+            if remaining <= 0:
+                break
+            batch = generate_batch(min(remaining, STREAM_CHUNK), length, use_symbols)
+            remaining -= len(batch)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@app.post("/evaluate-strength")
+async def evaluate_strength(req: PasswordStrengthRequest):
+    return score_password(req.password, get_breach_index())
+
+@app.post("/evaluate-strength/batch")
+async def evaluate_strength_batch(req: PasswordStrengthBatchRequest):
+    if len(req.passwords) > MAX_STRENGTH_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_STRENGTH_BATCH} passwords per request.")
+    return {"results": await run_in_threadpool(score_passwords, req.passwords, get_breach_index())}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of request and hot-path latency histograms."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/profile")
+async def metrics_profile(limit: int = Query(200, ge=1, le=10_000)):
+    """Collapsed stacks from the sampling profiler (start the API with PROFILER_ENABLED=1)."""
+    if not profiler.running and not profiler.stacks:
+        raise HTTPException(status_code=404, detail="Profiler is not enabled.")
+    return PlainTextResponse(profiler.collapsed(limit))
+
+def require_admin(authorization: str | None = Header(None)):
+    token = bearer_token(authorization)
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+@app.post("/admin/reload-model", dependencies=[Depends(require_admin)])
+async def reload_model_route(req: ReloadModelRequest):
+    """Publishes a new generator model and hot-swaps it; in-flight requests finish on the old one.
+
+    This worker swaps immediately; the others follow within NGRAM_MODEL_CHECK_INTERVAL.
+    """
+    try:
+        if req.corpus_paths:
+            model = await run_in_threadpool(update_model, req.corpus_paths)
+        else:
+            model = await run_in_threadpool(reload_model, req.snapshot_path)
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Model not reloaded: {e}")
+    return {"message": "Model reloaded.", "n": model.n, "prefixes": len(model)}
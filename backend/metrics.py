@@ -0,0 +1,243 @@
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+# In-process latency histograms and counters, rendered in the Prometheus text
+# format. With METRICS_ENABLED=0 spans are a shared no-op object and the
+# request middleware is not installed, so the hot paths pay one attribute load.
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+PROFILER_ENABLED = os.environ.get("PROFILER_ENABLED", "0") == "1"
+PROFILER_INTERVAL = float(os.environ.get("PROFILER_INTERVAL", "0.01"))
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count", "lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(LATENCY_BUCKETS, value)
+        with self.lock:
+            self.counts[i] += 1
+            self.total += value
+            self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._counters = Counter()  # (name, labels) -> int
+        self._gauges = {}  # name -> callable
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        histogram.observe(value)
+
+    def inc(self, name, labels, amount=1):
+        with self._lock:
+            self._counters[(name, labels)] += amount
+
+    def gauge(self, name, fn, text=""):
+        self._gauges[name] = fn
+        self._help[name] = text
+
+    def render(self):
+        lines = []
+
+        def header(name, kind):
+            lines.append(f"# HELP {name} {self._help.get(name, name)}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        seen = set()
+        for (name, labels), histogram in histograms:
+            if name not in seen:
+                header(name, "histogram")
+                seen.add(name)
+            with histogram.lock:
+                counts, total, count = list(histogram.counts), histogram.total, histogram.count
+            running = 0
+            for bound, bucket in zip(LATENCY_BUCKETS + (float("inf"),), counts):
+                running += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {running}")
+            lines.append(f"{name}_sum{_labels(labels)} {total}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+        for (name, labels), value in counters:
+            if name not in seen:
+                header(name, "counter")
+                seen.add(name)
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for name, fn in sorted(self._gauges.items()):
+            header(name, "gauge")
+            lines.append(f"{name} {fn()}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+registry = Registry()
+registry.describe("http_request_duration_seconds", "Request latency by method and route template.")
+registry.describe("http_requests_total", "Requests by method, route template and status.")
+registry.describe("span_duration_seconds", "Latency of instrumented hot-path operations.")
+
+
+class _Span:
+    __slots__ = ("labels", "start")
+
+    def __init__(self, name):
+        self.labels = (("span", name),)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        registry.observe("span_duration_seconds", self.labels, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name):
+    """Times the enclosed block into span_duration_seconds{span=name}."""
+    return _Span(name) if METRICS_ENABLED else _NOOP_SPAN
+
+
+def timed(name, fn):
+    """Wraps `fn` in a span; returns `fn` itself when metrics are disabled."""
+    if not METRICS_ENABLED:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        with _Span(name):
+            return fn(*args, **kwargs)
+
+    wrapper.__name__ = getattr(fn, "__name__", name)
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency and status per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            labels = (("method", scope["method"]), ("route", getattr(route, "path", "unmatched")))
+            registry.observe("http_request_duration_seconds", labels, time.perf_counter() - start)
+            registry.inc("http_requests_total", labels + (("status", str(status[0])),))
+
+
+def instrument_engine(engine):
+    """Times every SQL statement into span_duration_seconds{span="db.execute"}."""
+    if not METRICS_ENABLED:
+        return
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        registry.observe("span_duration_seconds", (("span", "db.execute"),), time.perf_counter() - started)
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval into collapsed-stack counts (flamegraph input)."""
+
+    def __init__(self, interval=PROFILER_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self, limit=200):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common(limit)) + "\n"
+
+
+profiler = SamplingProfiler()
+if PROFILER_ENABLED:
+    profiler.start()
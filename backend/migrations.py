@@ -0,0 +1,106 @@
+from sqlalchemy import (
+    Column, Integer, String, Boolean, ForeignKey, Index, MetaData, Table, false, inspect, text,
+)
+from sqlalchemy.schema import CreateColumn
+
+# Versioned schema migrations, applied in order and recorded in schema_version.
+# Each step describes the schema as of its version (never import the live
+# models here) and is idempotent, so databases created before versioning was
+# introduced are brought up to date by simply running every step. Every
+# worker runs them at startup, so each step holds a database write lock
+# across the version check (see _lock_for_migration).
+# Run standalone with `python -m backend.migrations`.
+
+
+def _initial_schema(conn):
+    metadata = MetaData()
+    Table(
+        "users", metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("email", String, unique=True, index=True, nullable=False),
+        Column("hashed_password", String, nullable=False),
+    )
+    Table(
+        "passwords", metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("site", String, nullable=False),
+        Column("encrypted_password", String, nullable=False),
+        Column("nonce", String, nullable=False),
+        Column("user_id", Integer, ForeignKey("users.id")),
+    )
+    metadata.create_all(conn, checkfirst=True)
+
+
+def _vault_lookup_indexes(conn):
+    passwords = Table("passwords", MetaData(), autoload_with=conn)
+    Index("ix_passwords_user_id", passwords.c.user_id).create(conn, checkfirst=True)
+    Index("ix_passwords_user_id_site", passwords.c.user_id, passwords.c.site).create(conn, checkfirst=True)
+
+
+def _add_column(conn, table, column):
+    if column.name in {existing["name"] for existing in inspect(conn).get_columns(table)}:
+        return
+    Table(table, MetaData(), column)  # bind the column to a table so its DDL compiles
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {CreateColumn(column).compile(dialect=conn.dialect)}"))
+
+
+def _envelope_encryption(conn):
+    _add_column(conn, "users", Column("kdf_salt", String, nullable=True))
+    _add_column(conn, "users", Column("kdf_iterations", Integer, nullable=True))
+    _add_column(conn, "users", Column("wrapped_key", String, nullable=True))
+    _add_column(conn, "passwords", Column("encrypted_with_data_key", Boolean, nullable=False, server_default=false()))
+
+
+MIGRATIONS = [
+    (1, "initial users and passwords tables", _initial_schema),
+    (2, "indexes for per-site lookup and keyset pagination", _vault_lookup_indexes),
+    (3, "envelope encryption columns", _envelope_encryption),
+]
+
+version_table = Table(
+    "schema_version", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+)
+
+
+MIGRATION_LOCK_KEY = 0x7661756c74  # arbitrary pg_advisory_xact_lock key
+
+
+def _lock_for_migration(conn):
+    """Serialises migration steps across processes until the transaction ends.
+
+    pysqlite runs DDL and SELECTs outside any transaction, so a plain begin()
+    would let two workers read the same version and both apply the step;
+    BEGIN IMMEDIATE takes SQLite's write lock up front instead.
+    """
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+def current_version(conn):
+    version_table.create(conn, checkfirst=True)
+    return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar()
+
+
+def run_migrations(engine):
+    """Applies pending migrations, each in its own locked transaction; returns the resulting version."""
+    for version, description, migrate in MIGRATIONS:
+        with engine.connect() as conn:
+            _lock_for_migration(conn)
+            if current_version(conn) >= version:
+                conn.rollback()
+                continue  # also covers another worker having applied it first
+            migrate(conn)
+            conn.execute(version_table.insert().values(version=version, description=description))
+            conn.commit()
+    with engine.connect() as conn:
+        return current_version(conn)
+
+
+if __name__ == "__main__":
+    from backend.database import engine
+
+    print(f"✅ Database schema at version {run_migrations(engine)}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, LargeBinary
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, LargeBinary, Index, Boolean, false
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
 
@@ -10,17 +10,26 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
+    # Envelope encryption: the vault data key, wrapped by PBKDF2(master password, kdf_salt, kdf_iterations)
+    kdf_salt = Column(String, nullable=True)
+    kdf_iterations = Column(Integer, nullable=True)
+    wrapped_key = Column(String, nullable=True)
 
     vault = relationship("PasswordVault", back_populates="owner")
 
 
 class PasswordVault(Base):
     __tablename__ = "passwords"
+    __table_args__ = (
+        Index("ix_passwords_user_id_site", "user_id", "site"),  # GET /vault/{site}
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     site = Column(String, nullable=False)
     encrypted_password = Column(String, nullable=False)
     nonce = Column(String, nullable=False)
+    # False for rows still encrypted with the legacy master-password/email-salt key
+    encrypted_with_data_key = Column(Boolean, nullable=False, default=False, server_default=false())
 
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)  # keyset pages by (user_id, id)
     owner = relationship("User", back_populates="vault")
\ No newline at end of file
@@ -0,0 +1,76 @@
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", "900"))
+SESSION_CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", "10000"))
+
+
+@dataclass
+class VaultSession:
+    user_id: int
+    email: str
+    key: bytearray  # vault data key, zeroed when the session ends
+    expires_at: float
+    legacy_key: bytearray | None = None  # only while pre-envelope rows remain
+
+
+def _wipe(session):
+    for key in (session.key, session.legacy_key):
+        for i in range(len(key or b"")):
+            key[i] = 0
+
+
+class SessionCache:
+    """Bounded token -> derived-key store with TTL expiry and LRU eviction."""
+
+    def __init__(self, ttl=SESSION_TTL_SECONDS, max_size=SESSION_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self, user_id, email, key, legacy_key=None):
+        token = secrets.token_urlsafe(32)
+        legacy_key = bytearray(legacy_key) if legacy_key is not None else None
+        session = VaultSession(user_id, email, bytearray(key), time.monotonic() + self.ttl, legacy_key)
+        with self._lock:
+            self._sessions[token] = session
+            while len(self._sessions) > self.max_size:
+                _, evicted = self._sessions.popitem(last=False)
+                _wipe(evicted)
+        return token
+
+    def get(self, token):
+        """Returns the live session for `token` (refreshing its LRU position) or None."""
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            if session.expires_at <= time.monotonic():
+                del self._sessions[token]
+                _wipe(session)
+                return None
+            self._sessions.move_to_end(token)
+            return session
+
+    def revoke(self, token):
+        with self._lock:
+            session = self._sessions.pop(token, None)
+        if session is not None:
+            _wipe(session)
+        return session is not None
+
+    def purge_expired(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [token for token, session in self._sessions.items() if session.expires_at <= now]
+            for token in expired:
+                _wipe(self._sessions.pop(token))
+        return len(expired)
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+
+# Character classes as bits; a password's pool size depends only on which
+# classes it uses, so both the pool and bits-per-character are 16-entry tables.
+LOWER, UPPER, DIGIT, OTHER = 1, 2, 4, 8
+POOL_SIZES = [
+    (26 if mask & LOWER else 0) + (26 if mask & UPPER else 0) + (10 if mask & DIGIT else 0) + (32 if mask & OTHER else 0)
+    for mask in range(16)
+]
+BITS_PER_CHAR = [math.log2(pool) if pool > 0 else 0.0 for pool in POOL_SIZES]
+
+_ASCII_CLASSES = np.full(256, OTHER, dtype=np.uint8)
+_ASCII_CLASSES[ord("a"):ord("z") + 1] = LOWER
+_ASCII_CLASSES[ord("A"):ord("Z") + 1] = UPPER
+_ASCII_CLASSES[ord("0"):ord("9") + 1] = DIGIT
+
+
+def rate(entropy, breached=False):
+    if breached or entropy < 40:  # a leaked password is weak whatever its entropy
+        return "Weak"
+    elif entropy < 60:
+        return "Moderate"
+    return "Strong"
+
+
+def _result(length, mask, breached=False):
+    entropy = round(length * BITS_PER_CHAR[mask]) if POOL_SIZES[mask] > 0 else 0
+    return {
+        "length": length,
+        "character_pool_size": POOL_SIZES[mask],
+        "entropy_bits": entropy,
+        "in_breach_corpus": breached,
+        "rating": rate(entropy, breached)
+    }
+
+
+def character_classes(pwd: str) -> int:
+    """Classifies every character in a single pass (Unicode-aware, like str.islower etc.)."""
+    mask = 0
+    for c in pwd:
+        if c.islower():
+            mask |= LOWER
+        elif c.isupper():
+            mask |= UPPER
+        elif c.isdigit():
+            mask |= DIGIT
+        elif not c.isalnum():
+            mask |= OTHER
+        if mask == 15:
+            break
+    return mask
+
+
+def score_password(pwd: str, breach_index=None) -> dict:
+    """Scores one password; pass a BreachIndex to flag and penalise leaked passwords."""
+    breached = breach_index is not None and pwd in breach_index
+    return _result(len(pwd), character_classes(pwd), breached)
+
+
+def score_passwords(passwords: list[str], breach_index=None) -> list[dict]:
+    """Scores a batch; ASCII passwords are classified together with one NumPy pass over their bytes."""
+    if breach_index is not None:
+        breached = breach_index.contains_many(passwords)
+    else:
+        breached = [False] * len(passwords)
+    results = [None] * len(passwords)
+    ascii_idx = []
+    for i, pwd in enumerate(passwords):
+        if pwd and pwd.isascii():
+            ascii_idx.append(i)
+        else:
+            results[i] = _result(len(pwd), character_classes(pwd), breached[i])
+    if ascii_idx:
+        chunk = [passwords[i] for i in ascii_idx]
+        lengths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        classes = _ASCII_CLASSES[np.frombuffer("".join(chunk).encode("ascii"), dtype=np.uint8)]
+        masks = np.bitwise_or.reduceat(classes, starts)
+        for i, length, mask in zip(ascii_idx, lengths.tolist(), masks.tolist()):
+            results[i] = _result(length, mask, breached[i])
+    return results
@@ -0,0 +1,61 @@
+import json
+import platform
+import time
+
+# Shared helpers for the benchmark scripts: latency summaries and JSON results
+# that can be compared across runs.
+
+
+def percentile(sorted_samples, p):
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * p))]
+
+
+def summarize(latencies, elapsed):
+    """Summarises per-call latencies (seconds) over `elapsed` seconds of wall time."""
+    samples = sorted(latencies)
+    return {
+        "count": len(samples),
+        "ops_per_s": len(samples) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": sum(samples) / len(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+    }
+
+
+def print_table(results):
+    print(f"{'name':>36} {'count':>8} {'ops/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, r in results.items():
+        print(f"{name:>36} {r['count']:>8} {r['ops_per_s']:>11,.1f} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f}")
+
+
+def save_results(path, kind, results, **meta):
+    with open(path, "w") as f:
+        json.dump({
+            "kind": kind,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            **meta,
+            "results": results,
+        }, f, indent=2)
+    print(f"✅ Results saved to {path}")
+
+
+def compare_results(baseline_path, results, tolerance):
+    """Prints throughput deltas against a saved run; returns the names that regressed beyond `tolerance`."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"{'name':>36} {'baseline ops/s':>15} {'ops/s':>11} {'change':>8}")
+    for name, r in results.items():
+        if name not in baseline or not baseline[name]["ops_per_s"]:
+            continue
+        change = r["ops_per_s"] / baseline[name]["ops_per_s"] - 1
+        flag = " ❌" if change < -tolerance else ""
+        print(f"{name:>36} {baseline[name]['ops_per_s']:>15,.1f} {r['ops_per_s']:>11,.1f} {change:>+7.1%}{flag}")
+        if change < -tolerance:
+            regressions.append(name)
+    return regressions
@@ -0,0 +1,31 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import time
+
+from ai_module.password_generator import generate_batch, generate_password
+
+# Compares passwords/s of generate_password in a Python loop against one
+# vectorised generate_batch call for the same number of passwords.
+
+parser = argparse.ArgumentParser(description="Loop vs batch password generation throughput")
+parser.add_argument("--counts", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+parser.add_argument("--length", type=int, default=12)
+parser.add_argument("--no-symbols", action="store_true")
+args = parser.parse_args()
+
+generate_batch(1)  # keep model loading and table building out of the timings
+use_symbols = not args.no_symbols
+
+print(f"{'count':>8} {'loop pw/s':>12} {'batch pw/s':>12} {'speedup':>8}")
+for count in args.counts:
+    start = time.perf_counter()
+    for _ in range(count):
+        generate_password(args.length, use_symbols)
+    loop = count / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    generate_batch(count, args.length, use_symbols)
+    batch = count / (time.perf_counter() - start)
+    print(f"{count:>8} {loop:>12,.0f} {batch:>12,.0f} {batch / loop:>7.1f}x")
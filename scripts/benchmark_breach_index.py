@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import random
+import string
+import tempfile
+import time
+
+from backend.breach import BreachIndex, build_index
+
+# Builds an index over N synthetic passwords and reports build time, file
+# size, RSS after mapping it and single/batch lookup latency.
+
+parser = argparse.ArgumentParser(description="Breach index lookup latency and RSS")
+parser.add_argument("--entries", type=int, default=10_000_000)
+parser.add_argument("--lookups", type=int, default=200_000)
+args = parser.parse_args()
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+def synthetic(i):
+    return f"pw{i}"
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "breach_index.bin")
+    start = time.perf_counter()
+    build_index((synthetic(i) for i in range(args.entries)), path)
+    print(f"✅ Built {args.entries:,} entries in {time.perf_counter() - start:.1f}s, {os.path.getsize(path) / 2**20:.1f} MiB on disk")
+
+    before = rss_mb()
+    index = BreachIndex(path)
+    print(f"   RSS before open {before:.1f} MiB, after open {rss_mb():.1f} MiB")
+
+    hits = [synthetic(random.randrange(args.entries)) for _ in range(args.lookups)]
+    misses = ["".join(random.choices(string.ascii_letters, k=12)) for _ in range(args.lookups)]
+    for name, sample in [("hit", hits), ("miss", misses)]:
+        start = time.perf_counter()
+        found = sum(1 for password in sample if password in index)
+        single = (time.perf_counter() - start) / len(sample) * 1e6
+        start = time.perf_counter()
+        batch_found = sum(index.contains_many(sample))
+        batch = (time.perf_counter() - start) / len(sample) * 1e6
+        print(f"   {name:>4}: {single:.2f} us/lookup single, {batch:.2f} us/lookup batched, {found}/{batch_found} found")
+    print(f"   RSS after lookups {rss_mb():.1f} MiB")
@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import tempfile
+import time
+
+# The API creates ./vault.db on import, so run against a throwaway directory.
+os.chdir(tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from backend.main import app
+
+# Onboarding cost of an N-entry vault: one /store-password per entry (with the
+# master password, or with a session token) versus a single /store-passwords.
+
+parser = argparse.ArgumentParser(description="Per-entry vs bulk vault store throughput")
+parser.add_argument("--entries", type=int, default=500)
+parser.add_argument("--legacy-sample", type=int, default=10, help="master-password requests to time (each runs both KDFs)")
+args = parser.parse_args()
+
+client = TestClient(app)
+credentials = {"email": "bench@example.com", "password": "correct horse battery staple"}
+client.post("/register", json=credentials)
+token = client.post("/login", json=credentials).json()["token"]
+auth = {"Authorization": f"Bearer {token}"}
+entries = [{"site": f"site{i}.example", "password": f"secret-{i}"} for i in range(args.entries)]
+
+def entries_per_second(count, send):
+    start = time.perf_counter()
+    send()
+    return count / (time.perf_counter() - start)
+
+legacy = entries_per_second(args.legacy_sample, lambda: [
+    client.post("/store-password", json={"email": credentials["email"], "master_password": credentials["password"], **entry}).raise_for_status()
+    for entry in entries[:args.legacy_sample]
+])
+single = entries_per_second(args.entries, lambda: [
+    client.post("/store-password", json=entry, headers=auth).raise_for_status() for entry in entries
+])
+bulk = entries_per_second(args.entries, lambda: client.post("/store-passwords", json={"entries": entries}, headers=auth).raise_for_status())
+
+print(f"{'mode':>26} {'entries/s':>10}")
+print(f"{'per entry, master password':>26} {legacy:>10,.1f}")
+print(f"{'per entry, session token':>26} {single:>10,.1f}")
+print(f"{'bulk /store-passwords':>26} {bulk:>10,.1f}")
@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import tempfile
+import time
+
+# Importing the API must not touch a real vault database.
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from sqlalchemy.orm import sessionmaker
+
+from ai_module.password_generator import get_model
+from backend.database import create_db_engine
+from backend.kdf import derive_key, hash_password, verify_password
+from backend.main import encrypt_password, decrypt_password
+from backend.migrations import run_migrations
+from backend.models import User, PasswordVault
+from scripts.bench_utils import compare_results, print_table, save_results, summarize
+
+# Micro-benchmarks for the hot paths behind the API. Each case runs for
+# --seconds and reports per-call latency percentiles.
+
+parser = argparse.ArgumentParser(description="Micro-benchmarks for generator, KDFs, AES-GCM and DB queries")
+parser.add_argument("--seconds", type=float, default=2.0, help="time budget per case")
+parser.add_argument("--only", nargs="*", help="run only cases whose name starts with one of these")
+parser.add_argument("--output", default="bench_micro.json")
+parser.add_argument("--compare", help="previous results JSON to compare against")
+parser.add_argument("--tolerance", type=float, default=0.15, help="allowed ops/s drop before --compare fails")
+args = parser.parse_args()
+
+def run_case(fn):
+    fn()  # warm-up, also builds lazy tables
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    while True:
+        t = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t)
+        if t >= deadline:
+            break
+    return summarize(latencies, time.perf_counter() - start)
+
+model = get_model()
+key = derive_key("bench master password", b"bench@example.com")
+encrypted = encrypt_password("correct horse battery staple", key)
+argon2_hash = hash_password("bench master password")
+
+tmp = tempfile.mkdtemp()
+engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+run_migrations(engine)
+Session = sessionmaker(bind=engine)
+with Session() as db:
+    user = User(email="bench@example.com", hashed_password=argon2_hash)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.add_all(PasswordVault(user_id=user_id, site=f"site{i}.example", nonce=encrypted["nonce"],
+                             encrypted_password=encrypted["ciphertext"], encrypted_with_data_key=True) for i in range(1000))
+    db.commit()
+
+def db_insert_commit():
+    with Session() as db:
+        db.add(PasswordVault(user_id=user_id, site="bench.example", nonce=encrypted["nonce"],
+                             encrypted_password=encrypted["ciphertext"], encrypted_with_data_key=True))
+        db.commit()
+
+def db_get_by_site():
+    with Session() as db:
+        db.query(PasswordVault).filter(PasswordVault.user_id == user_id, PasswordVault.site == "site500.example").first()
+
+def db_keyset_page():
+    with Session() as db:
+        db.query(PasswordVault).filter(PasswordVault.user_id == user_id, PasswordVault.id > 500).order_by(PasswordVault.id).limit(50).all()
+
+CASES = {
+    "ngram.generate": lambda: model.generate(max_length=12, min_length=8, include_symbols=True),
+    "ngram.generate_exact": lambda: model.generate_exact(12, include_symbols=True),
+    "ngram.generate_exact_batch[1000]": lambda: model.generate_exact_batch(1000, 12, include_symbols=True),
+    "kdf.derive_key": lambda: derive_key("bench master password", b"bench@example.com"),
+    "kdf.argon2_verify": lambda: verify_password(argon2_hash, "bench master password"),
+    "aes.encrypt_password": lambda: encrypt_password("correct horse battery staple", key),
+    "aes.decrypt_password": lambda: decrypt_password(encrypted, key),
+    "db.insert_commit": db_insert_commit,
+    "db.get_by_site": db_get_by_site,
+    "db.keyset_page": db_keyset_page,
+}
+
+results = {}
+for name, fn in CASES.items():
+    if args.only and not any(name.startswith(prefix) for prefix in args.only):
+        continue
+    results[name] = run_case(fn)
+    print(f"   {name}: {results[name]['ops_per_s']:,.1f} ops/s")
+
+print_table(results)
+save_results(args.output, "micro", results, seconds_per_case=args.seconds)
+if args.compare and compare_results(args.compare, results, args.tolerance):
+    sys.exit(1)
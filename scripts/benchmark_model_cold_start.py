@@ -0,0 +1,45 @@
+import sys
+import os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+import argparse
+import random
+import subprocess
+import tempfile
+
+from ai_module.password_generator import CORPUS_PATH, train_model
+
+# Measures time-to-first-password in a fresh interpreter, training from the
+# corpus versus mapping a compiled snapshot, as the corpus grows.
+
+parser = argparse.ArgumentParser(description="Cold-start benchmark: train at startup vs load snapshot")
+parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+args = parser.parse_args()
+
+FIRST_PASSWORD = (
+    "import time; start = time.perf_counter();"
+    "from ai_module.password_generator import generate_password; generate_password();"
+    "print(time.perf_counter() - start)"
+)
+
+def cold_start(corpus_path, snapshot_path):
+    env = dict(os.environ, NGRAM_CORPUS_PATH=corpus_path, NGRAM_MODEL_PATH=snapshot_path)
+    out = subprocess.run([sys.executable, "-c", FIRST_PASSWORD], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+with open(CORPUS_PATH, "r") as f:
+    seed = [line.strip() for line in f if line.strip()]
+
+print(f"{'passwords':>10} {'train s':>9} {'snapshot s':>11} {'speedup':>8}")
+with tempfile.TemporaryDirectory() as tmp:
+    for size in args.sizes:
+        corpus_path = os.path.join(tmp, f"corpus_{size}.txt")
+        snapshot_path = os.path.join(tmp, f"model_{size}.bin")
+        with open(corpus_path, "w") as f:
+            for i in range(size):
+                f.write(random.choice(seed) + (str(random.randrange(10_000)) if i >= len(seed) else "") + "\n")
+        train_model(corpus_path).save(snapshot_path)
+
+        trained = cold_start(corpus_path, os.path.join(tmp, "missing.bin"))
+        loaded = cold_start(corpus_path, snapshot_path)
+        print(f"{size:>10} {trained:>9.3f} {loaded:>11.3f} {trained / loaded:>7.1f}x")
@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import resource
+import time
+
+from ai_module.ngram_generator import NGramPasswordGenerator
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ai_module", "data", "passwords.txt")
+
+# Generates passwords back to back and reports latency and RSS per window.
+# With a read-only model both columns should stay flat for the whole run.
+
+parser = argparse.ArgumentParser(description="Memory/latency benchmark for NGramPasswordGenerator.generate")
+parser.add_argument("--generations", type=int, default=1_000_000)
+parser.add_argument("--windows", type=int, default=10)
+parser.add_argument("--no-symbols", action="store_true")
+args = parser.parse_args()
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+with open(DATA_PATH, "r") as f:
+    passwords = [line.strip() for line in f if line.strip()]
+
+model = NGramPasswordGenerator(n=3)
+model.train(passwords)
+print(f"✅ Trained on {len(passwords)} passwords ({len(model)} prefixes). RSS {rss_mb():.1f} MiB")
+
+window = max(1, args.generations // args.windows)
+include_symbols = not args.no_symbols
+print(f"{'generations':>12} {'us/password':>12} {'RSS MiB':>9}")
+done = 0
+while done < args.generations:
+    batch = min(window, args.generations - done)
+    start = time.perf_counter()
+    for _ in range(batch):
+        model.generate(max_length=12, min_length=8, include_symbols=include_symbols)
+    elapsed = time.perf_counter() - start
+    done += batch
+    print(f"{done:>12} {elapsed / batch * 1e6:>12.2f} {rss_mb():>9.1f}")
@@ -0,0 +1,42 @@
+import sys
+import os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+import argparse
+import tempfile
+import time
+
+# The API creates ./vault.db on import, so run against a throwaway directory.
+os.chdir(tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from backend.main import app
+
+# Compares vault throughput when every request re-sends the master password
+# (Argon2 verify + PBKDF2 per call) against a cached session token.
+
+parser = argparse.ArgumentParser(description="Vault req/s: master password per request vs session token")
+parser.add_argument("--requests", type=int, default=50)
+parser.add_argument("--entries", type=int, default=10)
+args = parser.parse_args()
+
+client = TestClient(app)
+credentials = {"email": "bench@example.com", "password": "correct horse battery staple"}
+client.post("/register", json=credentials)
+token = client.post("/login", json=credentials).json()["token"]
+auth = {"Authorization": f"Bearer {token}"}
+for i in range(args.entries):
+    client.post("/store-password", json={"site": f"site{i}.example", "password": f"secret-{i}"}, headers=auth)
+
+def rate(send):
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        send().raise_for_status()
+    return args.requests / (time.perf_counter() - start)
+
+legacy_body = {"email": credentials["email"], "master_password": credentials["password"]}
+print(f"{'endpoint':>20} {'master pw req/s':>16} {'token req/s':>12} {'speedup':>8}")
+for path, extra in [("/retrieve-passwords", {}), ("/store-password", {"site": "bench.example", "password": "x"})]:
+    legacy = rate(lambda: client.post(path, json={**legacy_body, **extra}))
+    session = rate(lambda: client.post(path, json=extra, headers=auth))
+    print(f"{path:>20} {legacy:>16,.1f} {session:>12,.1f} {session / legacy:>7.1f}x")
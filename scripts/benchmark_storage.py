@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import create_db_engine
+from backend.migrations import run_migrations
+from backend.models import User, PasswordVault
+
+# Mixed store/retrieve traffic from concurrent threads against a fresh SQLite
+# file, comparing SQLite's default journaling with the tuned WAL settings.
+
+parser = argparse.ArgumentParser(description="Concurrent store/retrieve benchmark for the storage layer")
+parser.add_argument("--writers", type=int, default=4)
+parser.add_argument("--readers", type=int, default=8)
+parser.add_argument("--seconds", type=float, default=5.0)
+parser.add_argument("--users", type=int, default=50)
+args = parser.parse_args()
+
+CONFIGS = [
+    ("default (DELETE, FULL)", {"journal_mode": "DELETE", "synchronous": "FULL", "cache_size": -2000}),
+    ("tuned (WAL, NORMAL)", {}),
+]
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000 if samples else 0.0
+
+def run(settings, path):
+    engine = create_db_engine(f"sqlite:///{path}", pool_size=args.writers + args.readers, **settings)
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        users = [User(email=f"user{i}@example.com", hashed_password="x") for i in range(args.users)]
+        db.add_all(users)
+        db.commit()
+        user_ids = [user.id for user in users]
+
+    latencies = {"store": [], "retrieve": []}
+    errors = []
+    deadline = time.perf_counter() + args.seconds
+
+    def writer():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                with Session() as db:
+                    db.add(PasswordVault(user_id=random.choice(user_ids), site="bench.example", nonce="n", encrypted_password="c", encrypted_with_data_key=True))
+                    db.commit()
+            except Exception as e:
+                errors.append(e)
+                continue
+            latencies["store"].append(time.perf_counter() - start)
+
+    def reader():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            with Session() as db:
+                db.query(PasswordVault).filter(PasswordVault.user_id == random.choice(user_ids)).order_by(PasswordVault.id).limit(50).all()
+            latencies["retrieve"].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=writer) for _ in range(args.writers)]
+    threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return latencies, errors
+
+print(f"{'config':>24} {'op':>9} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+with tempfile.TemporaryDirectory() as tmp:
+    for i, (name, settings) in enumerate(CONFIGS):
+        latencies, errors = run(settings, os.path.join(tmp, f"vault{i}.db"))
+        for op, samples in latencies.items():
+            print(f"{name:>24} {op:>9} {len(samples) / args.seconds:>9,.0f} {percentile(samples, 0.5):>8.2f} "
+                  f"{percentile(samples, 0.95):>8.2f} {percentile(samples, 0.99):>8.2f} {len(errors) if op == 'store' else '':>7}")
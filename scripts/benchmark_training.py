@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import random
+import tempfile
+import time
+
+from ai_module.ngram_generator import NGramPasswordGenerator
+from ai_module.password_generator import CORPUS_PATH, train_model, train_model_parallel
+from scripts.bench_utils import save_results
+
+# Training throughput (corpus lines per second) as the corpus grows: streamed
+# single-process training, sharded training across processes, and adding a
+# 10% increment to an existing model versus retraining from scratch.
+
+parser = argparse.ArgumentParser(description="n-gram training throughput vs corpus size")
+parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+parser.add_argument("--output", help="write results as JSON")
+args = parser.parse_args()
+
+with open(CORPUS_PATH, "r") as f:
+    seed = [line.strip() for line in f if line.strip()]
+
+def write_corpus(path, size):
+    with open(path, "w") as f:
+        for i in range(size):
+            f.write(random.choice(seed) + (str(random.randrange(10_000)) if i >= len(seed) else "") + "\n")
+
+def timed(fn, *fn_args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*fn_args, **kwargs)
+    return result, time.perf_counter() - start
+
+results = {}
+print(f"{'lines':>10} {'serial l/s':>12} {f'{args.workers} procs l/s':>14} {'increment s':>12} {'retrain s':>10}")
+with tempfile.TemporaryDirectory() as tmp:
+    for size in args.sizes:
+        corpus_path = os.path.join(tmp, f"corpus_{size}.txt")
+        increment_path = os.path.join(tmp, f"increment_{size}.txt")
+        write_corpus(corpus_path, size)
+        write_corpus(increment_path, max(1, size // 10))
+
+        serial, serial_s = timed(train_model, corpus_path)
+        parallel, parallel_s = timed(train_model_parallel, corpus_path, workers=args.workers)
+        assert parallel._thaw() == serial._thaw(), "sharded training must match serial training"
+
+        updated = NGramPasswordGenerator(n=serial.n).merge(serial)
+        _, increment_s = timed(updated.train_file, increment_path)
+        retrain = NGramPasswordGenerator(n=serial.n)
+        _, retrain_s = timed(lambda: retrain.train_file(corpus_path).train_file(increment_path))
+
+        results[str(size)] = {
+            "lines": size,
+            "serial_lines_per_s": size / serial_s,
+            "parallel_lines_per_s": size / parallel_s,
+            "workers": args.workers,
+            "increment_s": increment_s,
+            "retrain_s": retrain_s,
+        }
+        print(f"{size:>10} {size / serial_s:>12,.0f} {size / parallel_s:>14,.0f} {increment_s:>12.3f} {retrain_s:>10.3f}")
+
+if args.output:
+    save_results(args.output, "training", results, workers=args.workers)
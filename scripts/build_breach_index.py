@@ -0,0 +1,21 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import time
+
+from backend.breach import BREACH_CORPUS_PATH, BREACH_INDEX_PATH, build_index, read_corpus
+
+# Offline step: hash one or more leaked-password lists (one password per line,
+# read as a stream) into the memory-mapped index used by /evaluate-strength.
+# The API never builds the index itself; it skips breach checks until this has run.
+
+parser = argparse.ArgumentParser(description="Build the breach-corpus membership index")
+parser.add_argument("corpus", nargs="*", default=[BREACH_CORPUS_PATH])
+parser.add_argument("--output", default=BREACH_INDEX_PATH)
+parser.add_argument("--tmp-dir", help="scratch space for the on-disk partitions (needs ~8 bytes per password)")
+args = parser.parse_args()
+
+start = time.perf_counter()
+count = build_index(read_corpus(args.corpus), args.output, args.tmp_dir)
+print(f"✅ Indexed {count} unique passwords into {args.output} ({os.path.getsize(args.output) / 2**20:.1f} MiB) in {time.perf_counter() - start:.1f}s")
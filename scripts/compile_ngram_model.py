@@ -0,0 +1,31 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import time
+
+from ai_module.ngram_generator import NGramPasswordGenerator
+from ai_module.password_generator import CORPUS_PATH, SNAPSHOT_PATH, save_snapshot, train_model, train_model_parallel
+
+# Offline step: train the n-gram model once and write the snapshot that the
+# API memory-maps on first use (see ai_module.password_generator.get_model).
+# With --base the corpus is added to an existing snapshot instead of retraining;
+# Running workers notice the replaced snapshot and reload it on their own.
+
+parser = argparse.ArgumentParser(description="Compile the n-gram password model into a binary snapshot")
+parser.add_argument("--corpus", default=CORPUS_PATH)
+parser.add_argument("--output", default=SNAPSHOT_PATH)
+parser.add_argument("-n", type=int, default=3)
+parser.add_argument("--workers", type=int, default=1, help="train corpus shards in this many processes")
+parser.add_argument("--base", help="existing snapshot to add the corpus counts to")
+args = parser.parse_args()
+
+start = time.perf_counter()
+if args.workers > 1:
+    model = train_model_parallel(args.corpus, n=args.n, workers=args.workers)
+else:
+    model = train_model(args.corpus, n=args.n)
+if args.base:
+    model = NGramPasswordGenerator(n=args.n).merge(NGramPasswordGenerator.load(args.base)).merge(model)
+save_snapshot(model, args.output)
+print(f"✅ Compiled {len(model)} prefixes from {args.corpus} to {args.output} in {time.perf_counter() - start:.2f}s")
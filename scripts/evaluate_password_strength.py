@@ -1,23 +1,32 @@
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import requests
+import argparse
 import random
 import string
 import json
+import time
 
-# Endpoint
-url = "http://127.0.0.1:8000/evaluate-strength"
+from backend.strength import score_passwords
+from backend.breach import get_breach_index
+
+parser = argparse.ArgumentParser(description="Score AI, random and user passwords and export the results")
+parser.add_argument("--count", type=int, default=100, help="passwords per category")
+parser.add_argument("--url", help="score through a running API, e.g. http://127.0.0.1:8000 (default: in-process)")
+parser.add_argument("--batch-size", type=int, default=10_000)
+args = parser.parse_args()
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ai_module", "data", "passwords.txt")
 
 # --- Load real passwords ---
-with open("ai_module/data/passwords.txt", "r") as f:
+with open(DATA_PATH, "r") as f:
     real_passwords = [line.strip() for line in f if len(line.strip()) >= 8]
 
 # --- AI-generated passwords ---
 try:
-    from ai_module.password_generator import generate_password
-    print("✅ Imported generate_password")
-    ai_passwords = [generate_password(length=12) for _ in range(100)]
+    from ai_module.password_generator import generate_batch
+    print("✅ Imported generate_batch")
+    ai_passwords = generate_batch(args.count, length=12)
     print("✅ AI passwords generated.")
 except Exception as e:
     print(f"❌ Error importing or generating AI passwords: {e}")
@@ -29,22 +38,31 @@ def random_password(length=12):
     chars = string.ascii_letters + string.digits + "!@#$%^&*()"
     return ''.join(random.choice(chars) for _ in range(length))
 
-random_passwords = [random_password(12) for _ in range(100)]
+random_passwords = [random_password(12) for _ in range(args.count)]
 print("✅ Random passwords generated.")
 
 # --- User passwords (sampled from file) ---
-user_passwords = random.sample(real_passwords, 100)
+user_passwords = random.sample(real_passwords, args.count) if args.count <= len(real_passwords) else random.choices(real_passwords, k=args.count)
 print("✅ User passwords sampled.")
 
-# --- Helper: evaluate via API ---
-def evaluate(pwd):
+# --- Helper: evaluate in batches, in-process or via /evaluate-strength/batch ---
+if args.url:
+    import requests
+    http = requests.Session()  # one pooled connection for every batch
+
+if not args.url and get_breach_index() is None:
+    print("⚠️  No breach index found; run scripts/build_breach_index.py to enable breach checks.")
+
+def evaluate(pwds):
+    if not args.url:
+        return score_passwords(pwds, get_breach_index())
     try:
-        r = requests.post(url, json={"password": pwd})
+        r = http.post(f"{args.url}/evaluate-strength/batch", json={"passwords": pwds})
         r.raise_for_status()
-        return r.json()
+        return r.json()["results"]
     except Exception as e:
-        print(f"❌ Failed to evaluate password: {pwd[:10]}..., error: {e}")
-        return {"entropy_bits": 0, "rating": "Error", "length": len(pwd), "character_pool_size": 0}
+        print(f"❌ Failed to evaluate batch of {len(pwds)} passwords, error: {e}")
+        return [{"entropy_bits": 0, "rating": "Error", "length": len(pwd), "character_pool_size": 0, "in_breach_corpus": False} for pwd in pwds]
 
 # --- Evaluate all ---
 results = []
@@ -55,15 +73,16 @@ for category, pwds in [
     ("User", user_passwords),
 ]:
     print(f"🔍 Evaluating {category} passwords...")
-    for i, pwd in enumerate(pwds):
-        data = evaluate(pwd)
-        results.append({
-            "category": category,
-            "password": pwd,
-            **data
-        })
-        if i % 10 == 0:
-            print(f"   {category} {i + 1}/50 done")
+    start = time.perf_counter()
+    for offset in range(0, len(pwds), args.batch_size):
+        batch = pwds[offset:offset + args.batch_size]
+        for pwd, data in zip(batch, evaluate(batch)):
+            results.append({
+                "category": category,
+                "password": pwd,
+                **data
+            })
+    print(f"   {category}: {len(pwds)} done in {time.perf_counter() - start:.2f}s")
 
 print("✅ Evaluation complete.")
 
@@ -76,7 +95,7 @@ print("✅ Evaluation complete. Results saved to password_strength_results.json"
 import csv
 
 with open("password_strength_results.csv", "w", newline='') as csvfile:
-    writer = csv.DictWriter(csvfile, fieldnames=["category", "password", "length", "character_pool_size", "entropy_bits", "rating"])
+    writer = csv.DictWriter(csvfile, fieldnames=["category", "password", "length", "character_pool_size", "entropy_bits", "in_breach_corpus", "rating"])
     writer.writeheader()
     writer.writerows(results)
 
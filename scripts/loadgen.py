@@ -0,0 +1,113 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+from scripts.bench_utils import compare_results, print_table, save_results, summarize
+
+# Replays a weighted workload (JSON lines) with concurrent workers over pooled
+# HTTP connections, against a running server (--url) or the ASGI app in-process.
+#
+# Workload lines: {"name", "method", "path", "json"?, "weight"?, "auth"?, "phase"?}.
+# "auth" requests carry the benchmark user's session token; "phase": "setup"
+# lines run once before the measurement. "{rand}", "{email}" and "{password}"
+# in paths and JSON strings are substituted per request.
+
+parser = argparse.ArgumentParser(description="Asyncio load generator for the API")
+parser.add_argument("--workload", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "workload.jsonl"))
+parser.add_argument("--url", help="base URL of a running server, e.g. http://127.0.0.1:8000 (default: in-process ASGI app)")
+parser.add_argument("--concurrency", type=int, default=32)
+parser.add_argument("--duration", type=float, default=10.0, help="seconds of measured load")
+parser.add_argument("--output", default="bench_load.json")
+parser.add_argument("--compare", help="previous results JSON to compare against")
+parser.add_argument("--tolerance", type=float, default=0.15, help="allowed req/s drop before --compare fails")
+
+def substitute(value):
+    if isinstance(value, str):
+        return value.replace("{rand}", secrets.token_hex(6)).replace("{email}", user["email"]).replace("{password}", user["password"])
+    if isinstance(value, list):
+        return [substitute(item) for item in value]
+    if isinstance(value, dict):
+        return {key: substitute(item) for key, item in value.items()}
+    return value
+
+async def send(client, entry, headers):
+    return await client.request(
+        entry["method"],
+        substitute(entry["path"]),
+        json=substitute(entry["json"]) if "json" in entry else None,
+        headers=headers if entry.get("auth") else None,
+    )
+
+async def main():
+    if args.url:
+        transport = None
+        base_url = args.url
+    else:
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load.db')}")
+        from backend.main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://load-test"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=60) as client:
+        (await client.post("/register", json=user)).raise_for_status()
+        login = await client.post("/login", json=user)
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['token']}"}
+        for entry in setup:
+            (await send(client, entry, headers)).raise_for_status()
+
+        latencies = defaultdict(list)
+        statuses = defaultdict(Counter)
+        deadline = time.perf_counter() + args.duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                entry = random.choices(steady, weights)[0]
+                start = time.perf_counter()
+                try:
+                    response = await send(client, entry, headers)
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies[entry["name"]].append(time.perf_counter() - start)
+                statuses[entry["name"]][str(status)] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    results = {name: {**summarize(samples, elapsed), "statuses": dict(statuses[name])} for name, samples in sorted(latencies.items())}
+    results["total"] = summarize([s for samples in latencies.values() for s in samples], elapsed)
+    return results
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    with open(args.workload) as f:
+        workload = [json.loads(line) for line in f if line.strip()]
+    setup = [entry for entry in workload if entry.get("phase") == "setup"]
+    steady = [entry for entry in workload if entry.get("phase") != "setup"]
+    weights = [entry.get("weight", 1) for entry in steady]
+
+    user = {"email": f"load-{secrets.token_hex(4)}@example.com", "password": secrets.token_urlsafe(12)}
+
+    results = asyncio.run(main())
+    print_table(results)
+    for name, r in results.items():
+        if any(status != "200" for status in r.get("statuses", {})):
+            print(f"   ⚠️  {name}: {r['statuses']}")
+    save_results(args.output, "load", results, target=args.url or "in-process", concurrency=args.concurrency,
+                 duration=args.duration, workload=os.path.basename(args.workload))
+    if args.compare and compare_results(args.compare, results, args.tolerance):
+        sys.exit(1)
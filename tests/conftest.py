@@ -0,0 +1,11 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# backend.database builds its engine at import time, so the API tests get a
+# throwaway SQLite file before anything from backend is imported.
+_tmp = tempfile.mkdtemp(prefix="vault-tests-")
+atexit.register(shutil.rmtree, _tmp, ignore_errors=True)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/vault.db")
+os.environ.setdefault("RUN_MIGRATIONS_ON_STARTUP", "1")
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from backend import breach
+from backend.breach import BreachIndex, build_index, read_corpus
+
+LEAKED = ["password", "123456", "qwerty", " padded ", "pässwörd", "emoji🔑", "dup", "dup"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "breach.bin")
+    assert build_index(LEAKED, path) == len(set(LEAKED))
+    return BreachIndex(path)
+
+
+def test_membership(index):
+    for password in LEAKED:
+        assert password in index
+    for password in ["Password", "padded", "1234567", "", "pässwörd!"]:
+        assert password not in index
+
+
+def test_contains_many_matches_single_lookups(index):
+    candidates = LEAKED + ["nope", "qwerty1", "padded", "🔑"]
+    assert index.contains_many(candidates) == [password in index for password in candidates]
+    assert index.contains_many([]) == []
+
+
+def test_empty_index(tmp_path):
+    path = str(tmp_path / "empty.bin")
+    assert build_index([], path) == 0
+    index = BreachIndex(path)
+    assert "password" not in index
+    assert index.contains_many(["password"]) == [False]
+
+
+def test_build_leaves_no_temporary_files(tmp_path):
+    build_index(LEAKED, str(tmp_path / "breach.bin"))
+    assert os.listdir(tmp_path) == ["breach.bin"]
+
+
+def test_read_corpus_keeps_surrounding_spaces(tmp_path):
+    corpus = tmp_path / "leaked.txt"
+    corpus.write_bytes(b" padded \r\nplain\n\n\xff\n")
+    assert list(read_corpus([str(corpus)])) == [" padded ", "plain", "�"]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not-an-index.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        BreachIndex(str(path))
+
+
+def test_built_index_is_readable_by_other_users(tmp_path):
+    path = str(tmp_path / "breach.bin")
+    build_index(LEAKED, path)
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+
+def test_failed_build_leaves_nothing_behind(tmp_path):
+    def passwords():
+        yield "password"
+        raise RuntimeError("corpus went away")
+
+    with pytest.raises(RuntimeError):
+        build_index(passwords(), str(tmp_path / "breach.bin"))
+    assert os.listdir(tmp_path) == []
+
+
+def test_missing_index_is_rechecked_on_a_timer(tmp_path, monkeypatch):
+    path = str(tmp_path / "breach.bin")
+    now = [1000.0]
+    monkeypatch.setattr(breach, "BREACH_INDEX_PATH", path)
+    monkeypatch.setattr(breach, "BREACH_INDEX_CHECK_INTERVAL", 60)
+    monkeypatch.setattr(breach, "_index", None)
+    monkeypatch.setattr(breach, "_next_check", 0.0)
+    monkeypatch.setattr(breach.time, "monotonic", lambda: now[0])
+    opened = []
+    monkeypatch.setattr(breach, "BreachIndex", lambda p: opened.append(p) or BreachIndex(p))
+
+    assert breach.get_breach_index() is None
+    assert breach.get_breach_index() is None
+    assert len(opened) == 1  # the miss is remembered
+
+    build_index(LEAKED, path)
+    now[0] += 30
+    assert breach.get_breach_index() is None
+    now[0] += 31
+    index = breach.get_breach_index()
+    assert "password" in index
+    assert breach.get_breach_index() is index
+    assert len(opened) == 2
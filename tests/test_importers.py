@@ -0,0 +1,64 @@
+import io
+import json
+
+from backend.importers import parse_export
+
+
+def parse(text, fmt):
+    return list(parse_export(io.BytesIO(text.encode("utf-8")), fmt))
+
+
+def test_chrome_csv():
+    text = "name,url,username,password\nExample,https://example.com/login,me,hunter2\n"
+    assert parse(text, "csv") == [{"site": "https://example.com/login", "password": "hunter2"}]
+
+
+def test_csv_headers_are_case_insensitive_and_bom_is_skipped():
+    text = "\ufeffTitle,Login_Password\n  Bank  , s3cret \n"
+    assert parse(text, "csv") == [{"site": "Bank", "password": " s3cret "}]
+
+
+def test_csv_quoted_fields_and_missing_values():
+    text = 'url,password\n"https://a.com/?q=1,2","pa,ss"\nhttps://b.com,\n'
+    assert parse(text, "csv") == [
+        {"site": "https://a.com/?q=1,2", "password": "pa,ss"},
+        {"site": "https://b.com", "password": None},
+    ]
+
+
+def test_empty_csv():
+    assert parse("", "csv") == []
+
+
+def test_bitwarden_json():
+    export = {"items": [
+        {"name": "Example", "login": {"uris": [{"uri": "https://example.com"}], "password": "hunter2"}},
+        {"name": "Note without login"},
+    ]}
+    assert parse(json.dumps(export), "json") == [
+        {"site": "https://example.com", "password": "hunter2"},
+        {"site": "Note without login", "password": None},
+    ]
+
+
+def test_plain_json_list():
+    assert parse(json.dumps([{"site": "a.com", "password": "pw"}]), "json") == [{"site": "a.com", "password": "pw"}]
+
+
+def test_json_values_are_normalised_to_text():
+    items = [{"site": 5, "password": 7}, {"site": ["x"], "password": {"p": 1}}, {"site": True, "password": " pw "}, "junk"]
+    assert parse(json.dumps(items), "json") == [
+        {"site": "5", "password": "7"},
+        {"site": None, "password": None},
+        {"site": None, "password": " pw "},
+        {"site": None, "password": None},
+    ]
+
+
+def test_password_whitespace_is_preserved():
+    assert parse("url,password\n x.com , sp \nspaces.com,   \nempty.com,\n", "csv") == [
+        {"site": "x.com", "password": " sp "},
+        {"site": "spaces.com", "password": "   "},
+        {"site": "empty.com", "password": None},
+    ]
+    assert parse(json.dumps([{"site": " y.com ", "password": "\tpw "}]), "json") == [{"site": "y.com", "password": "\tpw "}]
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import backend.main as main
+from backend.kdf import KDFPool
+
+
+def blocking(gate):
+    def fn(*args):
+        gate.wait(10)
+        return True
+    return fn
+
+
+def test_pool_rejects_work_beyond_max_pending():
+    gate = threading.Event()
+    pool = KDFPool(kind="thread", workers=1, max_pending=2)
+
+    async def scenario():
+        queued = [asyncio.create_task(pool.run(blocking(gate))) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert pool.pending == 2
+        with pytest.raises(HTTPException) as rejected:
+            await pool.run(blocking(gate))
+        gate.set()
+        assert await asyncio.gather(*queued) == [True, True]
+        assert pool.pending == 0
+        assert await pool.run(len, "ok") == 2  # accepts work again once drained
+        return rejected.value
+
+    try:
+        rejected = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+    assert rejected.status_code == 503
+    assert rejected.headers == {"Retry-After": "1"}
+
+
+def test_saturated_pool_returns_503_while_cheap_endpoints_respond(monkeypatch):
+    gate = threading.Event()
+    pool = KDFPool(kind="thread", workers=1, max_pending=2)
+    monkeypatch.setattr(main, "kdf_pool", pool)
+    email = f"{uuid.uuid4().hex}@example.com"
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            assert (await http.post("/register", json={"email": email, "password": "pw"})).status_code == 200
+            monkeypatch.setattr(main, "verify_password", blocking(gate))
+            login = {"email": email, "password": "pw"}
+            stuck = [asyncio.create_task(http.post("/login", json=login)) for _ in range(2)]
+            while pool.pending < 2:
+                await asyncio.sleep(0.01)
+
+            rejected = await http.post("/login", json=login)
+            started = time.perf_counter()
+            cheap = [await http.post("/evaluate-strength", json={"password": "hunter2"}), await http.get("/metrics")]
+            cheap_elapsed = time.perf_counter() - started
+
+            gate.set()
+            return rejected, cheap, cheap_elapsed, await asyncio.gather(*stuck)
+
+    try:
+        rejected, cheap, cheap_elapsed, stuck = asyncio.run(scenario())
+    finally:
+        gate.set()
+        pool.shutdown()
+    assert rejected.status_code == 503
+    assert rejected.headers["retry-after"] == "1"
+    assert [response.status_code for response in cheap] == [200, 200]
+    assert cheap_elapsed < 1.0
+    assert [response.status_code for response in stuck] == [200, 200]
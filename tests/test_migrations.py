@@ -0,0 +1,75 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+
+from backend.database import create_db_engine
+from backend.migrations import MIGRATIONS, run_migrations
+from backend.models import Base
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The schema create_all produced before migrations existed, with one vault row.
+BASELINE_SCHEMA = """
+CREATE TABLE users (id INTEGER NOT NULL, email VARCHAR NOT NULL, hashed_password VARCHAR NOT NULL, PRIMARY KEY (id));
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE INDEX ix_users_id ON users (id);
+CREATE TABLE passwords (
+    id INTEGER NOT NULL, site VARCHAR NOT NULL, encrypted_password VARCHAR NOT NULL, nonce VARCHAR NOT NULL,
+    user_id INTEGER, PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE INDEX ix_passwords_id ON passwords (id);
+INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@example.com', 'hash');
+INSERT INTO passwords (id, site, encrypted_password, nonce, user_id) VALUES (1, 'example.com', 'ct', 'nonce', 1);
+"""
+
+
+def assert_matches_models(engine):
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        assert {c["name"] for c in inspector.get_columns(table.name)} == set(table.columns.keys())
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        assert {index.name for index in table.indexes} <= indexes
+
+
+def test_baseline_database_is_upgraded_in_place(tmp_path):
+    db_path = tmp_path / "vault.db"
+    engine = create_db_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA.split(";"):
+            if statement.strip():
+                conn.exec_driver_sql(statement)
+
+    assert run_migrations(engine) == MIGRATIONS[-1][0]
+    assert_matches_models(engine)
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT site, encrypted_with_data_key FROM passwords")).one()
+        user = conn.execute(text("SELECT email, wrapped_key FROM users")).one()
+    assert tuple(row) == ("example.com", 0)  # legacy row, migrated on the user's next unlock
+    assert tuple(user) == ("a@example.com", None)
+    assert run_migrations(engine) == MIGRATIONS[-1][0]  # idempotent
+
+
+def test_fresh_in_memory_database():
+    engine = create_db_engine("sqlite:///:memory:")
+    assert run_migrations(engine) == MIGRATIONS[-1][0]
+    assert_matches_models(engine)
+
+
+def test_concurrent_workers_on_a_fresh_database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'vault.db'}"
+    code = (
+        "import sys; from backend.database import create_db_engine; from backend.migrations import run_migrations;"
+        "print(run_migrations(create_db_engine(sys.argv[1])))"
+    )
+    workers = [
+        subprocess.Popen([sys.executable, "-c", code, url], cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        for _ in range(4)
+    ]
+    for worker in workers:
+        out, err = worker.communicate(timeout=60)
+        assert worker.returncode == 0, err
+        assert out.strip() == str(MIGRATIONS[-1][0])
+    with create_db_engine(url).connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar() == len(MIGRATIONS)
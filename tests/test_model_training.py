@@ -0,0 +1,155 @@
+import os
+import pickle
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from ai_module import password_generator
+from ai_module.ngram_generator import NGramPasswordGenerator
+
+BASE = ["password1", "letmein", "dragon", "monkey12"] * 50
+EXTRA = [["zzzzzzzzzzzz"] * 40, ["qqqqqqqqqqqq"] * 40, ["xyzxyzxyzxyz"] * 40]
+
+
+def trained(passwords, n=3):
+    model = NGramPasswordGenerator(n=n)
+    model.train(passwords)
+    return model
+
+
+def write_corpus(path, passwords, newline="\n"):
+    path.write_text("".join(p + newline for p in passwords), encoding="utf-8", newline="")
+    return str(path)
+
+
+def test_train_file_streams_the_same_counts(tmp_path):
+    corpus = write_corpus(tmp_path / "corpus.txt", BASE + [""], newline="\r\n")
+    assert NGramPasswordGenerator().train_file(corpus)._thaw() == trained(BASE)._thaw()
+
+
+def test_incremental_training_and_merge_match_one_pass():
+    one_pass = trained(BASE + EXTRA[0])._thaw()
+    incremental = trained(BASE)
+    incremental.train(EXTRA[0])
+    assert incremental._thaw() == one_pass
+    assert trained(BASE).merge(trained(EXTRA[0]))._thaw() == one_pass
+    with pytest.raises(ValueError):
+        trained(BASE).merge(trained(BASE, n=4))
+
+
+@pytest.mark.parametrize("workers", [1, 3, 7])
+def test_sharded_training_matches_serial(tmp_path, workers):
+    corpus = write_corpus(tmp_path / "corpus.txt", BASE + EXTRA[2])
+    parallel = password_generator.train_model_parallel(corpus, workers=workers)
+    assert parallel._thaw() == password_generator.train_model(corpus)._thaw()
+
+
+def test_snapshot_loaded_model_pickles(tmp_path):
+    path = str(tmp_path / "model.bin")
+    trained(BASE).save(path)
+    loaded = NGramPasswordGenerator.load(path)
+    assert pickle.loads(pickle.dumps(loaded))._thaw() == loaded._thaw()
+
+
+@pytest.fixture
+def published(tmp_path, monkeypatch):
+    """Points the module at a temporary published snapshot of BASE."""
+    path = str(tmp_path / "model.bin")
+    password_generator.save_snapshot(trained(BASE), path)
+    monkeypatch.setattr(password_generator, "SNAPSHOT_PATH", path)
+    monkeypatch.setattr(password_generator, "WARM_LENGTHS", (6,))
+    monkeypatch.setattr(password_generator, "_model", None)
+    monkeypatch.setattr(password_generator, "_snapshot_stamp", None)
+    return path
+
+
+def test_concurrent_updates_all_land(tmp_path, published):
+    corpora = [write_corpus(tmp_path / f"extra{i}.txt", extra) for i, extra in enumerate(EXTRA)]
+    threads = [threading.Thread(target=password_generator.update_model, args=([corpus],)) for corpus in corpora]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = trained(BASE + [p for extra in EXTRA for p in extra])._thaw()
+    assert NGramPasswordGenerator.load(published)._thaw() == expected
+    assert password_generator.get_model()._thaw() == expected
+
+
+def test_reload_publishes_a_snapshot(tmp_path, published):
+    candidate = str(tmp_path / "candidate.bin")
+    trained(EXTRA[0]).save(candidate)
+    live = password_generator.reload_model(candidate)
+    assert password_generator.get_model() is live
+    assert NGramPasswordGenerator.load(published)._thaw() == trained(EXTRA[0])._thaw()
+
+
+def test_unusable_model_is_not_published(tmp_path, published):
+    candidate = str(tmp_path / "candidate.bin")
+    trained(["ab"]).save(candidate)
+    with pytest.raises(ValueError):
+        password_generator.reload_model(candidate)
+    assert NGramPasswordGenerator.load(published)._thaw() == trained(BASE)._thaw()
+
+
+def test_published_snapshot_is_readable_by_other_users(published):
+    assert os.stat(published).st_mode & 0o777 == 0o644
+    assert os.listdir(os.path.dirname(published)) == ["model.bin"]
+
+
+def test_watcher_survives_bad_snapshots(published, monkeypatch):
+    password_generator.swap_model(NGramPasswordGenerator.load(published), password_generator._stamp(published))
+    real_swap = password_generator.swap_model
+    swaps = []
+
+    def flaky_swap(model, stamp=None):
+        swaps.append(stamp)
+        if len(swaps) == 1:
+            raise RuntimeError("unexpected")
+        return real_swap(model, stamp)
+
+    def truncate():
+        with open(published, "rb") as f:
+            data = f.read()
+        with open(published + ".new", "wb") as f:
+            f.write(data[:len(data) // 2])
+        os.replace(published + ".new", published)  # the live model still maps the old file
+
+    def publish():
+        assert password_generator.get_model()._thaw() == trained(BASE)._thaw()  # still on the last good model
+        password_generator.save_snapshot(trained(BASE + EXTRA[len(swaps)]), published)
+
+    class Stop(Exception):
+        pass
+
+    steps = iter([truncate, publish, publish])
+
+    def sleep(_):
+        step = next(steps, None)
+        if step is None:
+            raise Stop
+        step()
+
+    monkeypatch.setattr(password_generator, "swap_model", flaky_swap)
+    monkeypatch.setattr(password_generator, "time", SimpleNamespace(sleep=sleep))
+    with pytest.raises(Stop):
+        password_generator._watch_snapshot()
+    assert len(swaps) == 2
+    assert password_generator.get_model()._thaw() == trained(BASE + EXTRA[1])._thaw()
+
+
+def test_reload_endpoint_rejects_a_truncated_snapshot(tmp_path, published, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import backend.main as main
+
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    candidate = tmp_path / "candidate.bin"
+    trained(EXTRA[0]).save(candidate)
+    candidate.write_bytes(candidate.read_bytes()[:-3])
+    response = TestClient(main.app).post(
+        "/admin/reload-model", json={"snapshot_path": str(candidate)}, headers={"Authorization": "Bearer secret"}
+    )
+    assert response.status_code == 400
+    assert NGramPasswordGenerator.load(published)._thaw() == trained(BASE)._thaw()
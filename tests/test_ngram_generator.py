@@ -0,0 +1,104 @@
+import random
+from collections import Counter
+
+import pytest
+
+from ai_module.ngram_generator import NGramPasswordGenerator
+
+CORPUS = ["aab", "abb", "ab", "abab", "bba", "baab", "abba", "a"]
+SAMPLES = 20_000
+
+
+def trained(corpus=CORPUS, n=3):
+    model = NGramPasswordGenerator(n=n)
+    model.train(corpus)
+    return model
+
+
+def rejection_sample(model, length, include_symbols):
+    """Reference sampler: walk the chain until it ends, keep only exact-length results."""
+    symbols = "!@#$%^&*" if include_symbols else ""
+    while True:
+        prefix, result = "~" * (model.n - 1), ""
+        while len(result) <= length:
+            char = model._sample(prefix, symbols)
+            if char == "~":
+                break
+            result += char
+            prefix = prefix[1:] + char
+        if len(result) == length:
+            return result
+
+
+def symbol_class(password):
+    # Symbols are injected uniformly, so only where they appear needs to match.
+    return "".join("*" if c in "!@#$%^&*" else c for c in password)
+
+
+def total_variation(a, b):
+    return sum(abs(a[k] / SAMPLES - b[k] / SAMPLES) for k in set(a) | set(b)) / 2
+
+
+@pytest.mark.parametrize("length", [1, 3, 5])
+def test_generate_exact_has_requested_length(length):
+    model = trained()
+    assert all(len(model.generate_exact(length)) == length for _ in range(200))
+    assert all(len(p) == length for p in model.generate_exact_batch(200, length))
+
+
+@pytest.mark.parametrize("include_symbols", [False, True])
+def test_generate_exact_matches_rejection_sampling(include_symbols):
+    random.seed(1)
+    model = trained()
+    length = 3
+    exact = Counter(symbol_class(model.generate_exact(length, include_symbols)) for _ in range(SAMPLES))
+    batch = Counter(map(symbol_class, model.generate_exact_batch(SAMPLES, length, include_symbols)))
+    reference = Counter(symbol_class(rejection_sample(model, length, include_symbols)) for _ in range(SAMPLES))
+    assert total_variation(exact, reference) < 0.03
+    assert total_variation(batch, reference) < 0.03
+
+
+def test_generate_exact_rejects_impossible_length():
+    model = trained(["abc"])
+    with pytest.raises(ValueError):
+        model.generate_exact(5)
+    with pytest.raises(ValueError):
+        model.generate_exact_batch(3, 5)
+
+
+def test_snapshot_round_trip(tmp_path):
+    model = trained()
+    model.save(tmp_path / "model.bin")
+    loaded = NGramPasswordGenerator.load(tmp_path / "model.bin")
+    assert loaded.n == model.n
+    assert loaded._thaw() == model._thaw()
+
+
+@pytest.mark.parametrize("include_symbols", [False, True])
+def test_every_step_follows_a_trained_transition(include_symbols):
+    model = trained(["password1", "pass", "word99", "p@ss", "drow", "ssap"] * 3)
+    counts = model._thaw()
+    passwords = model.generate_exact_batch(2_000, 7, include_symbols) + [
+        model.generate_exact(7, include_symbols) for _ in range(500)
+    ]
+    for password in passwords:
+        prefix = "~" * (model.n - 1)
+        for char in password:
+            assert char in counts.get(prefix, {}) or (include_symbols and char in "!@#$%^&*"), (password, prefix, char)
+            prefix = prefix[1:] + char
+        assert prefix not in counts or "~" in counts[prefix], password  # the chain must be able to end here
+
+
+@pytest.mark.parametrize("cut", [
+    lambda data: data[:0],
+    lambda data: data[:7],  # shorter than the header
+    lambda data: data[:len(data) - 3],  # ends at an odd offset
+    lambda data: data[:len(data) // 2],
+    lambda data: data + b"\0" * 8,
+])
+def test_load_rejects_truncated_snapshots(tmp_path, cut):
+    path = tmp_path / "model.bin"
+    trained().save(path)
+    path.write_bytes(cut(path.read_bytes()))
+    with pytest.raises(ValueError):
+        NGramPasswordGenerator.load(path)
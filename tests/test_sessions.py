@@ -0,0 +1,76 @@
+import pytest
+
+from backend import sessions as sessions_module
+from backend.sessions import SessionCache
+
+KEY = b"k" * 32
+LEGACY_KEY = b"l" * 32
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sessions_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_session_round_trip():
+    cache = SessionCache(ttl=60, max_size=10)
+    token = cache.create(7, "a@example.com", KEY, LEGACY_KEY)
+    session = cache.get(token)
+    assert (session.user_id, session.email, bytes(session.key), bytes(session.legacy_key)) == (7, "a@example.com", KEY, LEGACY_KEY)
+    assert cache.get("unknown") is None
+
+
+def test_expiry_wipes_keys(clock):
+    cache = SessionCache(ttl=60, max_size=10)
+    token = cache.create(1, "a", KEY, LEGACY_KEY)
+    session = cache.get(token)
+    clock[0] += 59.9
+    assert cache.get(token) is session
+    clock[0] += 0.1
+    assert cache.get(token) is None
+    assert len(cache) == 0
+    assert session.key == bytearray(32) and session.legacy_key == bytearray(32)
+
+
+def test_purge_expired(clock):
+    cache = SessionCache(ttl=60, max_size=10)
+    old = cache.create(1, "a", KEY)
+    clock[0] += 30
+    fresh = cache.create(2, "b", KEY)
+    clock[0] += 30
+    assert cache.purge_expired() == 1
+    assert cache.get(old) is None and cache.get(fresh) is not None
+
+
+def test_lru_eviction_honours_get(clock):
+    cache = SessionCache(ttl=60, max_size=3)
+    a, b, c = (cache.create(i, str(i), KEY) for i in range(3))
+    evicted_b = cache._sessions[b]  # peek without refreshing b's position
+    assert cache.get(a) is not None  # a becomes most recently used, so b is now the oldest
+    d = cache.create(3, "3", KEY)
+    assert len(cache) == 3
+    assert cache.get(b) is None
+    assert evicted_b.key == bytearray(32)
+    e = cache.create(4, "4", KEY)  # c is now the oldest
+    assert cache.get(c) is None
+    assert all(cache.get(token) is not None for token in (a, d, e))
+
+
+def test_revoke_wipes_keys():
+    cache = SessionCache(ttl=60, max_size=10)
+    token = cache.create(1, "a", KEY, LEGACY_KEY)
+    session = cache.get(token)
+    assert cache.revoke(token)
+    assert not cache.revoke(token)
+    assert cache.get(token) is None
+    assert session.key == bytearray(32) and session.legacy_key == bytearray(32)
+
+
+def test_caller_buffers_are_copied():
+    key = bytearray(KEY)
+    cache = SessionCache(ttl=60, max_size=10)
+    token = cache.create(1, "a", key)
+    cache.revoke(token)
+    assert key == bytearray(KEY)  # wiping the session never touches the caller's buffer
@@ -0,0 +1,50 @@
+import random
+import string
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.main as main
+from backend.breach import BreachIndex, build_index, get_breach_index
+from backend.strength import score_password, score_passwords
+
+FIXED = [
+    "", "a", "A", "7", " ", "password", "Password1", "P@ssw0rd!", "\x00\x01\x7f", "tab\there", "new\nline",
+    "ünïcödé", "ÄBC", "١٢٣", "密码123", "emoji🔑Key9", "ß", "ǅ", "Ⅻ", "x" * 200,
+]
+
+
+def random_passwords(count, alphabet, seed):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randrange(0, 24))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("passwords", [
+    FIXED,
+    random_passwords(2_000, string.printable, seed=1),
+    random_passwords(2_000, [chr(c) for c in range(128)], seed=2),  # includes control characters
+    random_passwords(2_000, string.ascii_letters + "éüßĀ一٣🔑​", seed=3),
+])
+def test_batch_scoring_matches_single_scoring(passwords):
+    assert score_passwords(passwords) == [score_password(p) for p in passwords]
+
+
+def test_batch_scoring_matches_single_scoring_with_breach_index(tmp_path):
+    path = str(tmp_path / "breach.bin")
+    build_index(["password", "P@ssw0rd!", "密码123"], path)
+    index = BreachIndex(path)
+    results = score_passwords(FIXED, index)
+    assert results == [score_password(p, index) for p in FIXED]
+    assert [r["in_breach_corpus"] for r in results].count(True) == 3
+    assert all(r["rating"] == "Weak" for r in results if r["in_breach_corpus"])
+
+
+def test_batch_endpoint(monkeypatch):
+    client = TestClient(main.app)
+    response = client.post("/evaluate-strength/batch", json={"passwords": FIXED})
+    assert response.status_code == 200
+    assert response.json()["results"] == score_passwords(FIXED, get_breach_index())
+
+    monkeypatch.setattr(main, "MAX_STRENGTH_BATCH", 5)
+    assert client.post("/evaluate-strength/batch", json={"passwords": ["a"] * 5}).status_code == 200
+    assert client.post("/evaluate-strength/batch", json={"passwords": ["a"] * 6}).status_code == 413
@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.database import SessionLocal
+from backend.kdf import derive_key, hash_password
+from backend.main import app, encrypt_password
+from backend.models import PasswordVault, User
+
+LEGACY_ROWS = 450
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def legacy_user(master_password, rows=LEGACY_ROWS):
+    """Creates a user and vault as the pre-envelope code wrote them: no wrapped key, rows under derive_key(master, email)."""
+    email = f"{uuid.uuid4().hex}@example.com"
+    legacy_key = derive_key(master_password, email.encode())
+    db = SessionLocal()
+    try:
+        user = User(email=email, hashed_password=hash_password(master_password))
+        db.add(user)
+        db.flush()
+        for i in range(rows):
+            enc = encrypt_password(f"password-{i}", legacy_key)
+            db.add(PasswordVault(
+                user_id=user.id, site=f"site-{i}", nonce=enc["nonce"],
+                encrypted_password=enc["ciphertext"], encrypted_with_data_key=False,
+            ))
+        db.commit()
+    finally:
+        db.close()
+    return email
+
+
+def stored(email):
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).one()
+        rows = db.query(PasswordVault).filter(PasswordVault.user_id == user.id).all()
+        return user, rows
+    finally:
+        db.close()
+
+
+def retrieved(client, email, master_password):
+    response = client.post("/retrieve-passwords", json={"email": email, "master_password": master_password})
+    assert response.status_code == 200, response.text
+    return {item["site"]: item["password"] for item in response.json()["passwords"]}
+
+
+def expected(rows=LEGACY_ROWS):
+    return {f"site-{i}": f"password-{i}" for i in range(rows)}
+
+
+def test_legacy_vault_migrates_then_survives_password_change(client):
+    email = legacy_user("old master")
+    assert retrieved(client, email, "old master") == expected()
+
+    response = client.post("/change-master-password", json={
+        "email": email, "master_password": "old master", "new_master_password": "new master",
+    })
+    assert response.status_code == 200, response.text
+
+    user, rows = stored(email)
+    assert user.wrapped_key is not None
+    assert all(row.encrypted_with_data_key for row in rows)
+    assert retrieved(client, email, "new master") == expected()
+    assert client.post("/login", json={"email": email, "password": "old master"}).status_code == 401
+
+
+def test_concurrent_first_logins_agree_on_one_data_key(client):
+    email = legacy_user("master")
+
+    async def login_twice():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(
+                http.post("/login", json={"email": email, "password": "master"}) for _ in range(2)
+            ))
+
+    first, second = asyncio.run(login_twice())
+    assert first.status_code == second.status_code == 200
+    # Both sessions must hold the persisted key, whatever the migration has reached.
+    for response in (first, second):
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        assert client.get("/vault/site-0", headers=headers).json()["password"] == "password-0"
+        assert client.get(f"/vault/site-{LEGACY_ROWS - 1}", headers=headers).json()["password"] == f"password-{LEGACY_ROWS - 1}"
+    assert retrieved(client, email, "master") == expected()
+
+
+def test_registered_user_round_trip(client):
+    email = f"{uuid.uuid4().hex}@example.com"
+    assert client.post("/register", json={"email": email, "password": "pw"}).status_code == 200
+    token = client.post("/login", json={"email": email, "password": "pw"}).json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.post("/store-password", json={"site": "https://a.com/login", "password": "s3cret"}, headers=headers).status_code == 200
+    assert client.get("/vault/https://a.com/login", headers=headers).json()["password"] == "s3cret"
+    assert client.post("/change-master-password", json={
+        "email": email, "master_password": "pw", "new_master_password": "pw2",
+    }).status_code == 200
+    assert retrieved(client, email, "pw2") == {"https://a.com/login": "s3cret"}